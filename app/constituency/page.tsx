@@ -1,13 +1,14 @@
 "use client"
 
 import { useState, Suspense } from "react"
-import { ConstituencyFilter } from "@/components/constituency/constituency-filter"
+import { ConstituencyFilter, type ConstituencySelection } from "@/components/constituency/constituency-filter"
 import { ConstituencyHeader } from "@/components/constituency/constituency-header"
 import { FPTPResults } from "@/components/constituency/fptp-results"
 import { ProportionalResults } from "@/components/constituency/proportional-results"
 import { ElectionComparison } from "@/components/constituency/election-comparison"
-import { Vote, MapPin } from "lucide-react"
+import { Vote, MapPin, Loader2 } from "lucide-react"
 import { useUrlState } from "@/hooks/use-url-state"
+import { useJsonShard } from "@/hooks/use-json-data"
 import { defaultConstituencyFilterState } from "@/lib/filter-types"
 
 interface ConstituencyData {
@@ -27,7 +28,21 @@ interface ConstituencyData {
 
 function ConstituencyPageContent() {
   const [urlState, setUrlState] = useUrlState(defaultConstituencyFilterState)
-  const [selectedConstituency, setSelectedConstituency] = useState<ConstituencyData | null>(null)
+  const [selected, setSelected] = useState<ConstituencySelection | null>(null)
+
+  // The selected constituency's row comes from its own shard (a few KB),
+  // which also carries the live-count updates
+  const { data: shardRows } = useJsonShard<ConstituencyData>(
+    'dim_constituency_profile',
+    'by_constituency',
+    selected
+      ? { state_id: selected.state_id, district_id: selected.district_id, constituency_id: selected.constituency_id }
+      : null
+  )
+  // Until the new shard arrives, shardRows may still hold the previous selection
+  const selectedConstituency = shardRows?.find(
+    (c) => selected && c.district_id === selected.district_id && c.constituency_id === selected.constituency_id
+  ) ?? null
 
   return (
     <main>
@@ -54,7 +69,7 @@ function ConstituencyPageContent() {
         {/* Filter */}
         <div className="mb-8">
           <ConstituencyFilter
-            onSelect={setSelectedConstituency}
+            onSelect={setSelected}
             urlState={urlState}
             onUrlStateChange={setUrlState}
           />
@@ -94,6 +109,12 @@ function ConstituencyPageContent() {
             {/* Proportional Results */}
             <ProportionalResults results={selectedConstituency.proportional_2079_results} />
           </div>
+        ) : selected ? (
+          /* Loading the selected constituency's shard */
+          <div className="flex items-center justify-center gap-3 rounded-2xl border border-border bg-card/50 py-20">
+            <Loader2 className="h-5 w-5 animate-spin text-primary" />
+            <p className="text-muted-foreground">निर्वाचन क्षेत्र डेटा लोड हुँदैछ...</p>
+          </div>
         ) : (
           /* Empty State */
           <div className="flex flex-col items-center justify-center rounded-2xl border border-dashed border-border bg-card/50 py-20">
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the DuckDB JSON exporter against the previous pandas exporter.
+
+Exports every table in export_to_json.TABLES with both implementations,
+checks that the files contain the same JSON and prints the timings.
+
+Usage:
+    uv run benchmarks/bench_export.py [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_to_json  # noqa: E402
+
+
+# ============================================================================
+# REFERENCE IMPLEMENTATION (pandas + iterrows, as exported before)
+# ============================================================================
+
+def convert_value(val):
+    """Convert a value to JSON-serializable format."""
+    # Handle numpy arrays
+    if isinstance(val, np.ndarray):
+        return val.tolist()
+    # Handle pandas NA
+    if pd.isna(val):
+        return None
+    # Handle numpy types
+    if isinstance(val, (np.integer, np.int64, np.int32)):
+        return int(val)
+    if isinstance(val, (np.floating, np.float64, np.float32)):
+        return None if np.isnan(val) else float(val)
+    if isinstance(val, np.bool_):
+        return bool(val)
+    return val
+
+
+def export_table_to_json_pandas(db_path: str, table_name: str, output_file: str):
+    """Export a DuckDB table to JSON file through pandas, one cell at a time."""
+    con = duckdb.connect(db_path, read_only=True)
+    df = con.execute(f"SELECT * FROM {table_name}").df()
+
+    data = []
+    for _, row in df.iterrows():
+        record = {}
+        for col in df.columns:
+            record[col] = convert_value(row[col])
+        data.append(record)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    con.close()
+    return len(data)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def time_export(export_fn, table: str, output_file: str, repeat: int) -> float:
+    """Return the best wall time (seconds) of `repeat` exports."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        export_fn(export_to_json.SOURCE_DB, table, output_file)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the pandas and DuckDB JSON exporters.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per table, best time is reported (default: 3)")
+    args = parser.parse_args()
+
+    print(f"Source database: {export_to_json.SOURCE_DB}\n")
+    header = f"{'table':<40} {'rows':>7} {'pandas (s)':>11} {'duckdb (s)':>11} {'speedup':>8}  same JSON"
+    print(header)
+    print("-" * len(header))
+
+    total_old = total_new = 0.0
+    all_same = True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for table, output_name in export_to_json.table_entries():
+            old_file = os.path.join(tmp_dir, f"{output_name}.pandas.json")
+            new_file = os.path.join(tmp_dir, f"{output_name}.json")
+
+            old_time = time_export(export_table_to_json_pandas, table, old_file, args.repeat)
+            new_time = time_export(export_to_json.export_table_to_json, table, new_file, args.repeat)
+
+            with open(old_file, encoding='utf-8') as f:
+                old_data = json.load(f)
+            with open(new_file, encoding='utf-8') as f:
+                new_data = json.load(f)
+            same = old_data == new_data
+            all_same = all_same and same
+
+            total_old += old_time
+            total_new += new_time
+            print(f"{table:<40} {len(new_data):>7} {old_time:>11.3f} {new_time:>11.3f} "
+                  f"{old_time / new_time:>7.1f}x  {'yes' if same else 'NO'}")
+
+    print("-" * len(header))
+    print(f"{'total':<40} {'':>7} {total_old:>11.3f} {total_new:>11.3f} {total_old / total_new:>7.1f}x")
+    sys.exit(0 if all_same else 1)
+
+
+if __name__ == "__main__":
+    main()
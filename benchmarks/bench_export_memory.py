@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Measure peak memory of the JSON exporter as the table grows.
+
+Builds copies of dim_current_fptp_candidates scaled 1x, 2x, 4x, ... in a
+scratch database, exports each one in a fresh process with the batched and
+the streaming (--stream) writer, and prints the peak RSS of every run.
+The streaming column should stay flat while the batched one grows.
+
+Usage:
+    uv run benchmarks/bench_export_memory.py [--table NAME] [--scales 1,2,4,8,16]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_to_json  # noqa: E402
+
+
+def build_scaled_tables(db_path: str, table: str, scales: list[int]):
+    """Create table_<n>x in db_path holding n copies of the source table."""
+    con = duckdb.connect(db_path)
+    source_db = export_to_json.SOURCE_DB.replace("'", "''")
+    con.execute(f"ATTACH '{source_db}' AS src (READ_ONLY)")
+    for scale in scales:
+        con.execute(f"""
+            CREATE TABLE {table}_{scale}x AS
+            SELECT s.* FROM src.{table} s, range({scale})
+        """)
+    con.close()
+
+
+def run_child(db_path: str, table: str, output_file: str, stream: bool):
+    """Export one table and print peak RSS (MB) and wall time (s)."""
+    start = time.perf_counter()
+    rows = export_to_json.export_table_to_json(db_path, table, output_file, stream=stream)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"RESULT {rows} {peak_mb:.1f} {elapsed:.3f}")
+
+
+def measure(db_path: str, table: str, output_file: str, stream: bool):
+    """Run an export in a fresh interpreter and return (rows, peak_mb, seconds)."""
+    cmd = [sys.executable, __file__, "--child", db_path, table, output_file]
+    if stream:
+        cmd.append("--stream")
+    output = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    result = next(line for line in output.splitlines() if line.startswith("RESULT"))
+    rows, peak_mb, seconds = result.split()[1:]
+    return int(rows), float(peak_mb), float(seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of the batched vs streaming JSON export.")
+    parser.add_argument("--table", default="dim_current_fptp_candidates", help="Source table to scale up")
+    parser.add_argument("--scales", default="1,2,4,8,16", help="Comma separated row multipliers")
+    parser.add_argument("--child", nargs=3, metavar=("DB", "TABLE", "OUTPUT"), help=argparse.SUPPRESS)
+    parser.add_argument("--stream", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child, stream=args.stream)
+        return
+
+    scales = [int(s) for s in args.scales.split(",")]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "scaled.db")
+        output_file = os.path.join(tmp_dir, "out.json")
+        print(f"Building scaled copies of {args.table}: {', '.join(f'{s}x' for s in scales)}\n")
+        build_scaled_tables(db_path, args.table, scales)
+
+        header = f"{'scale':>6} {'rows':>9} {'file (MB)':>10} {'batched RSS (MB)':>17} {'streamed RSS (MB)':>18}"
+        print(header)
+        print("-" * len(header))
+        for scale in scales:
+            table = f"{args.table}_{scale}x"
+            rows, batched_mb, _ = measure(db_path, table, output_file, stream=False)
+            _, streamed_mb, _ = measure(db_path, table, output_file, stream=True)
+            file_mb = os.path.getsize(output_file) / (1024 * 1024)
+            print(f"{scale:>5}x {rows:>9} {file_mb:>10.1f} {batched_mb:>17.1f} {streamed_mb:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
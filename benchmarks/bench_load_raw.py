@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark the raw loader: inferred vs declared schemas, sequential vs concurrent.
+
+Loads every source in load_raw_data.DATA_FILES into a scratch database
+three ways and prints the timings:
+
+    auto        read_json_auto / read_csv_auto, one table at a time (previous loader)
+    declared    column types from raw_schemas.py, one table at a time
+    concurrent  column types from raw_schemas.py, --workers tables at a time
+
+Also checks that every variant loads the same number of rows and lists
+columns whose declared type differs from the inferred one.
+
+Usage:
+    uv run benchmarks/bench_load_raw.py [--repeat N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import duckdb
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import load_raw_data  # noqa: E402
+
+
+def available_sources():
+    """Return the DATA_FILES entries whose files exist."""
+    sources = {}
+    for table_name, file_path in load_raw_data.DATA_FILES.items():
+        if "*" in file_path or Path(file_path).exists():
+            sources[table_name] = file_path
+    return sources
+
+
+def load_table(con, table_name, file_path, auto_schema):
+    """Create one raw table and return (seconds, row count)."""
+    start = time.perf_counter()
+    reader = load_raw_data.reader_for(table_name, file_path, auto_schema=auto_schema)
+    con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {reader}")
+    rows = con.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+    return time.perf_counter() - start, rows
+
+
+def run_variant(db_path, sources, auto_schema, workers):
+    """Load all sources into a fresh database; return (wall seconds, {table: (seconds, rows)})."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    con = duckdb.connect(db_path)
+
+    def run(table_name, file_path):
+        cursor = con.cursor()
+        try:
+            return load_table(cursor, table_name, file_path, auto_schema)
+        finally:
+            cursor.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(run, name, path) for name, path in sources.items()}
+    results = {name: future.result() for name, future in futures.items()}
+    wall = time.perf_counter() - start
+    con.close()
+    return wall, results
+
+
+def column_types(db_path):
+    """Return {(table, column): type} for a database."""
+    con = duckdb.connect(db_path, read_only=True)
+    rows = con.execute(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns"
+    ).fetchall()
+    con.close()
+    return {(table, column): data_type for table, column, data_type in rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark raw data loading.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (best time is reported)")
+    parser.add_argument("--workers", type=int, default=min(len(load_raw_data.DATA_FILES), os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    sources = available_sources()
+    variants = [
+        ("auto", True, 1),
+        ("declared", False, 1),
+        ("concurrent", False, args.workers),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        best = {}
+        types = {}
+        for name, auto_schema, workers in variants:
+            db_path = os.path.join(tmp_dir, f"{name}.db")
+            runs = [run_variant(db_path, sources, auto_schema, workers) for _ in range(args.repeat)]
+            best[name] = min(runs, key=lambda run: run[0])
+            types[name] = column_types(db_path)
+
+    print(f"{'table':<48} {'rows':>8} " + " ".join(f"{name:>11}" for name, _, _ in variants))
+    mismatched = False
+    for table_name in sources:
+        rows = {name: best[name][1][table_name][1] for name, _, _ in variants}
+        if len(set(rows.values())) > 1:
+            mismatched = True
+            print(f"  ✗ Row counts differ for {table_name}: {rows}")
+        timings = " ".join(f"{best[name][1][table_name][0]:>10.3f}s" for name, _, _ in variants)
+        print(f"{table_name:<48} {rows['auto']:>8,} {timings}")
+    totals = " ".join(f"{best[name][0]:>10.3f}s" for name, _, _ in variants)
+    print(f"{'total (wall)':<48} {'':>8} {totals}")
+    print(f"\nBest of {args.repeat} run(s), concurrent variant with {args.workers} worker(s)")
+
+    changed = {
+        key: (inferred, types["declared"].get(key))
+        for key, inferred in types["auto"].items()
+        if types["declared"].get(key) != inferred
+    }
+    if changed:
+        print("\nColumns whose declared type differs from the inferred one:")
+        for (table_name, column), (inferred, declared) in sorted(changed.items()):
+            print(f"  {table_name}.{column}: {inferred} -> {declared}")
+
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
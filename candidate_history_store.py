@@ -0,0 +1,279 @@
+"""
+Compacted store of the candidate profiles written by candidate_profile_fetcher.py.
+
+All profiles live in a single Parquet file sorted by candidate_id and
+written in small row groups. The min/max statistics of each row group act
+as the candidate_id index: looking up a few candidates only reads the row
+groups that can contain them, and load_raw_data.py reads the whole store
+in one scan instead of opening thousands of small JSON files.
+
+Parquet cannot be appended to in place, so an append merges the new
+profiles into the store (replacing older versions of the same candidates)
+and atomically swaps in the rewritten file, fsynced before and after the
+rename so a crash leaves either the old or the new store. check_store()
+drops rows that cannot be read or fail validation, so the fetcher fetches
+those candidates again instead of treating them as done.
+
+Next to the store, <store>.fingerprints.json records per candidate the
+hashes of the input and system prompt a profile was researched from, the
+model and when it was fetched, so the fetcher can tell which profiles are
+out of date.
+
+Usage:
+    uv run candidate_history_store.py compact [--remove-json]
+    uv run candidate_history_store.py show CANDIDATE_ID
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from glob import glob
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from raw_schemas import SOURCE_SCHEMAS, columns_argument
+
+STORE_PATH = "data/candidates_history.parquet"
+HISTORY_DIR = "data/candidates_history"
+PROFILE_SCHEMA = SOURCE_SCHEMAS["candidates_political_history"]
+# Rows per row group; small groups make candidate_id lookups selective
+ROW_GROUP_SIZE = 128
+
+
+def read_profiles_sql(source):
+    """Return a read_json call parsing profile JSON files with the declared types."""
+    return f"read_json({source}, columns = {columns_argument(PROFILE_SCHEMA)})"
+
+
+def write_table(table, store_path=STORE_PATH):
+    """Atomically replace the store with an Arrow table: temp file, fsync, rename, fsync the directory."""
+    Path(store_path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{store_path}.tmp"
+    # pyarrow honours small row group sizes exactly; DuckDB's COPY rounds up to 2048 rows
+    pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE, compression="zstd")
+    with open(tmp_path, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, store_path)
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        fd = os.open(os.path.dirname(os.path.abspath(store_path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def write_store(con, select_sql, store_path=STORE_PATH):
+    """Write the rows of a query to the store, sorted by candidate_id, via a temp file."""
+    columns = ", ".join(f'"{name}"' for name in PROFILE_SCHEMA)
+    reader = pa.RecordBatchReader.from_stream(
+        con.execute(f"SELECT {columns} FROM ({select_sql}) ORDER BY candidate_id").arrow()
+    )
+    write_table(reader.read_all(), store_path)
+
+
+def merge_sql(new_rows_sql, store_path=STORE_PATH):
+    """Union new rows with the store, keeping the new version of each candidate."""
+    if not os.path.exists(store_path):
+        return new_rows_sql
+    return f"""
+        SELECT * EXCLUDE (priority) FROM (
+            SELECT *, 1 AS priority FROM ({new_rows_sql})
+            UNION ALL BY NAME
+            SELECT *, 0 AS priority FROM read_parquet('{store_path}')
+        )
+        QUALIFY row_number() OVER (PARTITION BY candidate_id ORDER BY priority DESC) = 1
+    """
+
+
+def append_profiles(profiles, store_path=STORE_PATH):
+    """
+    Add or replace profiles (dicts shaped like CandidateProfileResponse) in the store.
+
+    Returns the number of profiles in the store afterwards.
+    """
+    if not profiles:
+        return count_profiles(store_path)
+    with tempfile.NamedTemporaryFile("w", suffix=".ndjson", encoding="utf-8", delete=False) as f:
+        for profile in profiles:
+            f.write(json.dumps(profile, ensure_ascii=False) + "\n")
+        batch_path = f.name
+    try:
+        con = duckdb.connect()
+        source = f"'{batch_path}'"
+        new_rows = f"SELECT * FROM {read_profiles_sql(source)}"
+        write_store(con, merge_sql(new_rows, store_path), store_path)
+        con.close()
+    finally:
+        os.remove(batch_path)
+    return count_profiles(store_path)
+
+
+def compact(history_dir=HISTORY_DIR, store_path=STORE_PATH, remove_json=False):
+    """
+    Merge the per-candidate JSON files of history_dir into the store.
+
+    JSON files take precedence over rows already in the store. With
+    remove_json the merged files are deleted afterwards. Returns the number
+    of files merged.
+    """
+    paths = sorted(glob(os.path.join(history_dir, "*.json")))
+    if not paths:
+        return 0
+    source = "[" + ", ".join(f"'{p}'" for p in paths) + "]"
+    con = duckdb.connect()
+    write_store(con, merge_sql(f"SELECT * FROM {read_profiles_sql(source)}", store_path), store_path)
+    con.close()
+    if remove_json:
+        for path in paths:
+            os.remove(path)
+    return len(paths)
+
+
+def count_profiles(store_path=STORE_PATH):
+    """Return the number of profiles in the store (0 if it does not exist)."""
+    if not os.path.exists(store_path):
+        return 0
+    with duckdb.connect() as con:
+        return con.execute(f"SELECT COUNT(*) FROM read_parquet('{store_path}')").fetchone()[0]
+
+
+def stored_candidate_ids(store_path=STORE_PATH):
+    """Return the set of candidate ids in the store (reads only that column)."""
+    if not os.path.exists(store_path):
+        return set()
+    with duckdb.connect() as con:
+        rows = con.execute(f"SELECT candidate_id FROM read_parquet('{store_path}')").fetchall()
+    return {candidate_id for (candidate_id,) in rows}
+
+
+def check_store(store_path=STORE_PATH, validate=None):
+    """
+    Drop the profiles that cannot be read or fail validate(profile) from the store.
+
+    Reads the store row group by row group, so one damaged group only costs
+    its own rows. A store whose footer is unreadable is moved aside to
+    <store>.corrupt. A temp file left by an interrupted write is removed.
+    Returns {"checked", "invalid" (candidate ids), "unreadable_row_groups",
+    "corrupt"}; the dropped candidates are no longer in stored_candidate_ids().
+    """
+    report = {"checked": 0, "invalid": [], "unreadable_row_groups": 0, "corrupt": False}
+    if os.path.exists(f"{store_path}.tmp"):
+        os.remove(f"{store_path}.tmp")
+    if not os.path.exists(store_path):
+        return report
+    try:
+        parquet_file = pq.ParquetFile(store_path)
+    except Exception:
+        os.replace(store_path, f"{store_path}.corrupt")
+        report["corrupt"] = True
+        return report
+
+    tables = []
+    for index in range(parquet_file.num_row_groups):
+        try:
+            table = parquet_file.read_row_group(index)
+        except Exception:
+            report["unreadable_row_groups"] += 1
+            continue
+        keep = []
+        for profile in table.to_pylist():
+            report["checked"] += 1
+            try:
+                if validate is not None:
+                    validate(profile)
+                keep.append(True)
+            except Exception:
+                report["invalid"].append(profile.get("candidate_id"))
+                keep.append(False)
+        tables.append(table.filter(pa.array(keep, type=pa.bool_())))
+
+    schema = parquet_file.schema_arrow
+    parquet_file.close()
+    if report["invalid"] or report["unreadable_row_groups"]:
+        write_table(pa.concat_tables(tables) if tables else schema.empty_table(), store_path)
+    return report
+
+
+def fingerprints_path(store_path=STORE_PATH):
+    """Path of the fingerprint file kept next to a store."""
+    return f"{os.path.splitext(store_path)[0]}.fingerprints.json"
+
+
+def load_fingerprints(store_path=STORE_PATH):
+    """Return {candidate_id (str): fingerprint dict} of a store ({} if there is none)."""
+    path = fingerprints_path(store_path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fingerprints(fingerprints, store_path=STORE_PATH):
+    """Atomically replace the fingerprint file of a store."""
+    path = fingerprints_path(store_path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(fingerprints.items(), key=lambda item: int(item[0]))), f, indent=1)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_profiles(candidate_ids=None, store_path=STORE_PATH):
+    """
+    Return stored profiles as dicts, optionally only the given candidate ids.
+
+    Filtering on candidate_id is pushed down to the row-group statistics.
+    """
+    if not os.path.exists(store_path):
+        return []
+    query = f"SELECT to_json(p)::VARCHAR FROM read_parquet('{store_path}') p"
+    params = []
+    if candidate_ids is not None:
+        query += " WHERE candidate_id IN (SELECT unnest(?::BIGINT[]))"
+        params.append(list(candidate_ids))
+    with duckdb.connect() as con:
+        rows = con.execute(query + " ORDER BY candidate_id", params).fetchall()
+    return [json.loads(row) for (row,) in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the compacted candidate profile store.")
+    parser.add_argument("--store", default=STORE_PATH, help=f"Parquet store (default: {STORE_PATH})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = subparsers.add_parser("compact", help="Merge per-candidate JSON files into the store")
+    compact_parser.add_argument("--history-dir", default=HISTORY_DIR, help=f"JSON directory (default: {HISTORY_DIR})")
+    compact_parser.add_argument("--remove-json", action="store_true", help="Delete the JSON files once merged")
+
+    show_parser = subparsers.add_parser("show", help="Print the stored profile of a candidate")
+    show_parser.add_argument("candidate_id", type=int)
+
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        merged = compact(args.history_dir, args.store, remove_json=args.remove_json)
+        if not merged:
+            print(f"No JSON files in {args.history_dir}, nothing to compact")
+            return
+        print(f"✓ Merged {merged} file(s) into {args.store} ({count_profiles(args.store)} profiles)")
+        if args.remove_json:
+            print(f"✓ Removed {merged} file(s) from {args.history_dir}")
+    elif args.command == "show":
+        profiles = read_profiles([args.candidate_id], args.store)
+        if not profiles:
+            print(f"✗ Candidate {args.candidate_id} not in {args.store}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(profiles[0], ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Batch-API mode of candidate_profile_fetcher.py for bulk, non-urgent refreshes.
+
+Instead of one interactive generate_content call per candidate, the
+requests are written as JSONL (one {"key": candidate_id, "request": ...}
+line each), uploaded and submitted as Gemini batch jobs of up to
+BATCH_SIZE requests, which cost less per token and finish within a day.
+The jobs are polled until done; each job's JSONL output is then validated
+as CandidateProfileResponse and enriched from its grounding metadata in
+bulk, off the event loop, and handed to the fetcher's writer like
+interactive results.
+
+Submitted jobs are recorded in <store>.batch_jobs.json (with the input
+hash of every request) until their output is saved to the store, so an interrupted
+run resumes polling them instead of submitting (and paying for) the same
+requests again. Requests whose candidate input changed in the meantime
+are submitted anew and their old results ignored.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from google.genai import types
+
+from candidate_profile_fetcher import (
+    CandidateProfileResponse,
+    build_user_message,
+    enrich_profile_with_grounding_metadata,
+    fingerprint,
+)
+
+BATCH_SIZE = 1000
+POLL_INTERVAL = 60.0
+SUCCEEDED_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_PARTIALLY_SUCCEEDED"}
+DONE_STATES = SUCCEEDED_STATES | {"JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def jobs_path(store_path):
+    """Path of the file recording the submitted jobs of a store."""
+    return f"{os.path.splitext(store_path)[0]}.batch_jobs.json"
+
+
+def load_jobs(store_path):
+    path = jobs_path(store_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_jobs(jobs, store_path):
+    """Atomically replace the job record (removed once no job is left)."""
+    path = jobs_path(store_path)
+    if not jobs:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(jobs, f, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+
+def batch_request(candidate: dict, system_prompt: str) -> dict:
+    """The GenerateContentRequest of a candidate, as call_gemini_api() sends it."""
+    return {
+        "contents": [{"role": "user", "parts": [{"text": build_user_message(candidate)}]}],
+        "system_instruction": {"parts": [{"text": system_prompt}]},
+        "tools": [{"google_search": {}}],
+        "generation_config": {
+            "response_mime_type": "application/json",
+            "response_json_schema": CandidateProfileResponse.model_json_schema(),
+        },
+    }
+
+
+def write_requests(candidates, path, system_prompt):
+    """Write the batch input JSONL of candidates, keyed by candidate_id."""
+    with open(path, "w", encoding="utf-8") as f:
+        for candidate in candidates:
+            line = {"key": str(candidate["candidate_id"]), "request": batch_request(candidate, system_prompt)}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+def parse_result(record: dict):
+    """
+    Turn one line of a job's output into (candidate_id, profile, tokens, error).
+
+    The profile is validated and enriched from the response's grounding
+    metadata; error is set instead when the request failed or the
+    response does not validate.
+    """
+    candidate_id = int(record["key"])
+    if "response" not in record:
+        return candidate_id, None, 0, ValueError(f"Batch request failed: {record.get('error') or record.get('status')}")
+    response = types.GenerateContentResponse.model_validate(record["response"])
+    usage = response.usage_metadata.model_dump() if response.usage_metadata else {}
+    tokens = usage.get("total_token_count") or 0
+    try:
+        if not response.text:
+            raise ValueError("Empty response from Gemini API")
+        profile = CandidateProfileResponse.model_validate_json(response.text)
+    except ValueError as e:
+        return candidate_id, None, tokens, e
+    grounding = response.candidates[0].grounding_metadata if response.candidates else None
+    if grounding:
+        profile = enrich_profile_with_grounding_metadata(
+            profile, grounding.model_dump(mode="json", by_alias=True, exclude_none=True)
+        )
+    profile._token_usage = {
+        name: value for name, value in usage.items() if name.endswith("token_count") and isinstance(value, int)
+    }
+    return candidate_id, profile, tokens, None
+
+
+def parse_output(path):
+    """Parse a job's output JSONL; returns {candidate_id: (profile, tokens, error)}."""
+    results = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                candidate_id, profile, tokens, error = parse_result(json.loads(line))
+            except (ValueError, KeyError) as e:
+                print(f"  Warning: unreadable batch output line ({type(e).__name__}: {e})")
+                continue
+            results[candidate_id] = (profile, tokens, error)
+    return results
+
+
+async def run_batches(
+    client,
+    items,
+    system_prompt: str,
+    prompt_hash: str,
+    model_name: str,
+    on_result,
+    store_path: str,
+    batch_size: int = BATCH_SIZE,
+    poll_interval: float = POLL_INTERVAL,
+    flush=None,
+) -> dict:
+    """
+    Research items ((display_num, candidate) pairs) through batch jobs and
+    pass each outcome to `await on_result(item, (profile, tokens), error)`.
+
+    A finished job stays recorded until `await flush()` confirms that the
+    outcomes handed to on_result are persisted (returns True), so paid
+    output is never lost to a crash in between. Jobs left by an
+    interrupted run for the same model and prompt are polled again rather
+    than resubmitted. Returns the run's statistics.
+    """
+    start = time.perf_counter()
+    by_id = {candidate["candidate_id"]: (display_num, candidate) for display_num, candidate in items}
+    # Requests are keyed "<candidate_id>" with the hash of the input they were built from
+    inputs = {str(candidate_id): fingerprint(candidate, prompt_hash, model_name)["input"]
+              for candidate_id, (_, candidate) in by_id.items()}
+    stats = {"jobs": 0, "resumed_jobs": 0, "completed": 0, "failed": 0, "tokens": 0}
+
+    def current(job):
+        """The requests of a job that still match the candidates to research."""
+        if job["model"] != model_name or job["prompt"] != prompt_hash:
+            return set()
+        return {key for key, input_hash in job["inputs"].items() if inputs.get(key) == input_hash}
+
+    jobs = []
+    for job in load_jobs(store_path):
+        if current(job):
+            print(f"  Resuming batch job {job['name']} ({len(current(job))}/{len(job['inputs'])} requests still current)")
+            jobs.append(job)
+            stats["resumed_jobs"] += 1
+        else:
+            print(f"  Dropping batch job {job['name']}: its model, prompt or candidates are no longer current")
+    save_jobs(jobs, store_path)
+    submitted = set().union(*(current(job) for job in jobs))
+    remaining = [candidate for candidate_id, (_, candidate) in by_id.items() if str(candidate_id) not in submitted]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for index in range(0, len(remaining), batch_size):
+            chunk = remaining[index:index + batch_size]
+            requests_path = os.path.join(work_dir, f"requests-{index // batch_size}.jsonl")
+            await asyncio.to_thread(write_requests, chunk, requests_path, system_prompt)
+            display_name = f"candidate-profiles-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{index // batch_size}"
+            uploaded = await client.aio.files.upload(
+                file=requests_path, config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl")
+            )
+            batch_job = await client.aio.batches.create(
+                model=model_name, src=uploaded.name, config=types.CreateBatchJobConfig(display_name=display_name)
+            )
+            jobs.append({
+                "name": batch_job.name,
+                "model": model_name,
+                "prompt": prompt_hash,
+                "inputs": {str(candidate["candidate_id"]): inputs[str(candidate["candidate_id"])] for candidate in chunk},
+                "submitted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            })
+            save_jobs(jobs, store_path)
+            print(f"  Submitted batch job {batch_job.name} with {len(chunk)} requests")
+        stats["jobs"] = len(jobs)
+
+        pending = list(jobs)
+        while pending:
+            for job in list(pending):
+                batch_job = await client.aio.batches.get(name=job["name"])
+                state = getattr(batch_job.state, "name", str(batch_job.state))
+                if state not in DONE_STATES:
+                    continue
+                pending.remove(job)
+                print(f"  Batch job {job['name']}: {state}")
+                results = {}
+                if state in SUCCEEDED_STATES and batch_job.dest and batch_job.dest.file_name:
+                    output_path = os.path.join(work_dir, job["name"].replace("/", "_") + ".jsonl")
+                    await client.aio.files.download(file=batch_job.dest.file_name, destination=output_path)
+                    # Validating thousands of profiles is CPU-bound; keep it off the event loop
+                    results = await asyncio.to_thread(parse_output, output_path)
+                for key in current(job):
+                    candidate_id = int(key)
+                    profile, tokens, error = results.get(
+                        candidate_id, (None, 0, ValueError(f"No result from batch job ({state}: {batch_job.error})"))
+                    )
+                    stats["tokens"] += tokens
+                    stats["completed" if error is None else "failed"] += 1
+                    await on_result(by_id[candidate_id], (profile, tokens), error)
+                if flush is not None and not await flush():
+                    print(f"  Keeping batch job {job['name']}: its profiles could not all be saved, rerun to retry")
+                    continue
+                jobs.remove(job)
+                save_jobs(jobs, store_path)
+            if pending:
+                await asyncio.sleep(poll_interval)
+
+    elapsed = time.perf_counter() - start
+    stats.update({"seconds": elapsed, "tokens_per_second": stats["tokens"] / elapsed if elapsed else 0.0})
+    return stats
@@ -4,20 +4,48 @@ Candidate Profile Fetcher
 This module fetches and enriches candidate profiles by calling Gemini Pro with a system prompt.
 It includes:
 - Pydantic models to validate the LLM response
-- Async concurrent fetching with configurable concurrency
-- Caching logic to skip already-processed candidates
+- Interactive calls through an adaptive, rate-aware work queue (work_queue.py): concurrency grows while
+  calls succeed and backs off on 429s / server errors, which are retried;
+  or, for bulk refreshes, Gemini batch jobs (candidate_profile_batch.py)
+- The system prompt and search tool registered once per run as a cached
+  context (where the API allows it), and compact SOURCE JSON payloads
+- Caching keyed on the research input: a stored profile is reused until the
+  candidate's source data (other than its photo URL), the system prompt or the
+  model changes, or it is older than an optional maximum age
+- A writer task appending fetched profiles to the compacted profile store
+  (candidate_history_store.py) in batches, off the event loop, with one atomic
+  fsynced rewrite per batch; unreadable or invalid stored profiles are dropped
+  at startup so those candidates are fetched again
 """
 
 import asyncio
+import hashlib
 import json
 import os
-from pathlib import Path
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 import google.genai as genai
+import httpx
 from google.genai import types
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+
+import work_queue
+from candidate_history_store import (
+    STORE_PATH,
+    append_profiles,
+    check_store,
+    load_fingerprints,
+    save_fingerprints,
+    stored_candidate_ids,
+)
+from work_queue import AimdLimiter, run_queue
+
+# Source fields left out of the input fingerprint: mirroring the photos
+# (scrape_scripts/mirror_candidate_photos.py) replaces the remote URL with a
+# site path, which does not change what the model researches
+VOLATILE_SOURCE_FIELDS = ("candidate_image_url",)
+REMOTE_PHOTO_URL = "https://result.election.gov.np/Images/Candidate/{}.jpg"
 
 
 # ============================================================================
@@ -89,6 +117,9 @@ class CandidateProfileResponse(BaseModel):
         description="Integer rating 0-100 based on wins vs. scandals"
     )
 
+    # Token counts of the response this profile came from (not part of the schema)
+    _token_usage: dict = PrivateAttr(default_factory=dict)
+
     @field_validator("political_history")
     def validate_political_history_limit(cls, v):
         """Ensure max 35 political history events"""
@@ -107,7 +138,7 @@ class CandidateProfileResponse(BaseModel):
 
 async def fetch_candidate_profiles(
     candidates_json_path: str = "public/data/dim_current_fptp_candidates.json",
-    output_dir: str = "data/candidates_history",
+    store_path: str = STORE_PATH,
     system_prompt_path: str = "candidate_profile_researcher.md",
     api_key: Optional[str] = None,
     model_name: str = "gemini-3-flash-preview",
@@ -115,41 +146,71 @@ async def fetch_candidate_profiles(
     offset: int = 0,
     candidate_id: Optional[int] = None,
     skip_existing: bool = True,
+    max_age_days: Optional[float] = None,
     include_new_candidates: bool = False,
     concurrency: int = 5,
+    flush_every: int = 20,
+    flush_interval: float = 30.0,
+    initial_concurrency: int = 4,
+    retries: int = work_queue.RETRIES,
+    backoff: float = work_queue.BACKOFF,
+    latency_target: Optional[float] = None,
+    client=None,
+    batch: bool = False,
+    batch_size: int = 1000,
+    poll_interval: float = 60.0,
+    cache_ttl: float = 3600.0,
 ) -> dict:
     """
     Fetch candidate profiles from Gemini concurrently using async.
 
     Args:
         candidates_json_path: Path to the candidates JSON file
-        output_dir: Directory to save candidate profile JSONs
+        store_path: Parquet store the validated profiles are appended to
         system_prompt_path: Path to the system prompt markdown file
         api_key: Google API key (uses GOOGLE_API_KEY env var if not provided)
         model_name: Model name to use (default: gemini-3-flash-preview)
         limit: Limit number of candidates to process (None = process all)
         offset: Number of candidates to skip from the start (default: 0)
         candidate_id: Specific candidate ID to fetch (overrides offset/limit)
-        skip_existing: Skip candidates that already have saved profiles
+        skip_existing: Skip candidates whose saved profile is up to date: researched
+            from the same input, system prompt and model (see refetch_reason)
+        max_age_days: Also refetch saved profiles older than this many days
+            (default: None, profiles do not expire)
         include_new_candidates: Include candidates where is_new_candidate is True
             (default: False, skips them since they have no history)
-        concurrency: Number of concurrent API requests (default: 5)
+        concurrency: Maximum number of concurrent API requests (default: 5)
+        flush_every: Append fetched profiles to the store in batches of this size
+            (default: 20); at most one batch is lost if the run is interrupted
+        flush_interval: Also append a partial batch once no profile arrived for
+            this many seconds (default: 30)
+        initial_concurrency: Concurrent requests to start with; the limit grows
+            towards `concurrency` while requests succeed (default: 4)
+        retries: Retries per candidate on rate-limit / server errors (default: 4)
+        backoff: Initial retry delay in seconds, doubled per attempt and jittered (default: 1.0)
+        latency_target: Back off when a request takes longer than this many seconds
+            (default: None, only errors slow the queue down)
+        client: GenAI client to use instead of creating one (e.g. a stand-in in tests)
+        batch: Submit the requests as batch jobs instead of interactive calls
+            (cheaper, finishes within a day; see candidate_profile_batch.py)
+        batch_size: Requests per batch job (default: 1000)
+        poll_interval: Seconds between batch job status checks (default: 60)
+        cache_ttl: Lifetime in seconds of the cached system prompt context,
+            extended while the run lasts (default: 3600; 0 disables caching)
 
     Returns:
         Dictionary with statistics about the processing
     """
     # Setup
-    api_key = api_key or os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "Google API key not provided. "
-            "Set GOOGLE_API_KEY environment variable or pass api_key parameter."
-        )
+    if client is None:
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError(
+                "Google API key not provided. "
+                "Set GOOGLE_API_KEY environment variable or pass api_key parameter."
+            )
 
-    client = genai.Client(api_key=api_key)
-
-    # Create output directory if it doesn't exist
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+        client = genai.Client(api_key=api_key)
 
     # Load candidates JSON
     if not os.path.exists(candidates_json_path):
@@ -176,6 +237,8 @@ async def fetch_candidate_profiles(
         "successful": 0,
         "failed": 0,
         "errors": [],
+        "queue": None,
+        "prompt": {"input_tokens": 0, "cached_input_tokens": 0, "input_chars": 0, "chars_saved": 0},
     }
     stats_lock = asyncio.Lock()
 
@@ -200,17 +263,41 @@ async def fetch_candidate_profiles(
         candidates = candidates[:limit]
 
     # Build list of candidates to process (filtering out skips upfront)
+    prompt_hash = text_hash(system_prompt)
+    fingerprints = load_fingerprints(store_path)
+    adopted = upgraded = 0
+    existing_ids = set()
+    if skip_existing:
+        # Damaged or invalid stored profiles must not count as done
+        check = await asyncio.to_thread(check_store, store_path, CandidateProfileResponse.model_validate)
+        if check["corrupt"]:
+            print(f"Warning: {store_path} is unreadable; moved it to {store_path}.corrupt, fetching everything again")
+        if check["unreadable_row_groups"]:
+            print(f"Warning: dropped {check['unreadable_row_groups']} unreadable row group(s) of {store_path}")
+        if check["invalid"]:
+            print(f"Warning: re-queueing {len(check['invalid'])} invalid stored profile(s): {check['invalid'][:10]}")
+        existing_ids = stored_candidate_ids(store_path)
     to_process = []
     for idx, candidate in enumerate(candidates):
         cid = candidate.get("candidate_id")
         candidate_name = candidate.get("candidate_name", "Unknown")
         display_num = offset + idx + 1
-        output_path = Path(output_dir) / f"{cid}.json"
 
-        if skip_existing and output_path.exists():
-            print(f"  [{display_num}] SKIP (exists): {cid} - {candidate_name}")
-            stats["skipped"] += 1
-            continue
+        if cid in existing_ids:
+            current = fingerprint(candidate, prompt_hash, model_name)
+            if str(cid) not in fingerprints:
+                # Researched before fingerprints were kept: take the current
+                # inputs as its baseline, later changes are then detected
+                fingerprints[str(cid)] = current
+                adopted += 1
+            elif upgrade_fingerprint(fingerprints[str(cid)], candidate, current):
+                upgraded += 1
+            reason = refetch_reason(fingerprints[str(cid)], current, max_age_days)
+            if reason is None:
+                print(f"  [{display_num}] SKIP (up to date): {cid} - {candidate_name}")
+                stats["skipped"] += 1
+                continue
+            print(f"  [{display_num}] REFETCH ({reason}): {cid} - {candidate_name}")
 
         if not include_new_candidates and candidate.get("is_new_candidate", False):
             print(f"  [{display_num}] SKIP (new candidate): {cid} - {candidate_name}")
@@ -220,57 +307,184 @@ async def fetch_candidate_profiles(
         to_process.append((display_num, candidate))
 
     stats["total_candidates"] = len(candidates)
+    if adopted or upgraded:
+        save_fingerprints(fingerprints, store_path)
+    if adopted:
+        print(f"Recorded the current inputs of {adopted} previously fetched profile(s) as their baseline")
+    if upgraded:
+        print(f"Carried {upgraded} fingerprint(s) over from an earlier input format")
 
     print(f"\nStarting candidate profile fetch...")
     print(f"  Total candidates: {len(candidates)}")
     print(f"  To process: {len(to_process)}")
     print(f"  Skipped: {stats['skipped']}")
-    print(f"  Concurrency: {concurrency}")
+    if batch:
+        print(f"  Mode: batch jobs of up to {batch_size} requests")
+    else:
+        print(f"  Concurrency: {initial_concurrency} initially, adapting up to {concurrency}")
     print(f"  Model: {model_name}")
-    print(f"  Output directory: {output_dir}\n")
+    print(f"  Output store: {store_path}\n")
 
     if not to_process:
         print("Nothing to process.")
         return stats
 
-    semaphore = asyncio.Semaphore(concurrency)
-
-    async def process_one(display_num: int, candidate: dict):
-        cid = candidate.get("candidate_id")
-        candidate_name = candidate.get("candidate_name", "Unknown")
-        output_path = Path(output_dir) / f"{cid}.json"
-
-        async with semaphore:
-            print(f"  [{display_num}] PROCESSING: {cid} - {candidate_name}")
+    # Fetched profiles, appended to the store by the writer task
+    writes: asyncio.Queue = asyncio.Queue()
+
+    async def save(batch: List[tuple]) -> bool:
+        """Append a batch of (profile, fingerprint) to the store (one atomic rewrite and fsync); False on failure."""
+        profiles = [profile for profile, _ in batch]
+        try:
+            # Rewriting the Parquet store is blocking; keep it off the event loop
+            await asyncio.to_thread(append_profiles, profiles, store_path)
+            fingerprints.update({str(profile["candidate_id"]): entry for profile, entry in batch})
+            await asyncio.to_thread(save_fingerprints, dict(fingerprints), store_path)
+        except Exception as e:
+            error_msg = f"{type(e).__name__}: {str(e)}"
+            print(f"        FAILED to save {len(batch)} profile(s): {error_msg}")
+            async with stats_lock:
+                stats["failed"] += len(batch)
+                for profile in profiles:
+                    stats["errors"].append({"candidate_id": profile["candidate_id"], "error": error_msg})
+            return False
+        print(f"        Saved {len(batch)} profile(s) to {store_path}")
+        async with stats_lock:
+            stats["successful"] += len(batch)
+        return True
+
+    async def writer():
+        """
+        Save queued profiles every flush_every profiles, flush_interval idle
+        seconds and at the end. A queued future is a flush request: the
+        pending profiles are saved right away and the future resolves to
+        whether every save since the previous flush succeeded.
+        """
+        batch: List[tuple] = []
+        saved = True
+        finished = False
+        while not finished:
+            flush_request = None
             try:
-                validated_profile = await call_gemini_api(
-                    client=client,
-                    candidate=candidate,
-                    system_prompt=system_prompt,
-                    model_name=model_name,
-                )
-
-                profile_dict = validated_profile.model_dump()
-                # File I/O is fast enough to do synchronously for small JSON files
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(profile_dict, f, ensure_ascii=False, indent=2)
-
-                print(f"        [{display_num}] Saved: {cid} - {candidate_name}")
-                async with stats_lock:
-                    stats["successful"] += 1
-                    stats["processed"] += 1
-
+                entry = await asyncio.wait_for(writes.get(), timeout=flush_interval if batch else None)
+                if entry is None:
+                    finished = True
+                elif isinstance(entry, asyncio.Future):
+                    flush_request = entry
+                else:
+                    batch.append(entry)
+                    if len(batch) < flush_every:
+                        continue
+            except asyncio.TimeoutError:
+                pass
+            if batch:
+                saved = await save(batch) and saved
+                batch = []
+            if flush_request is not None:
+                flush_request.set_result(saved)
+                saved = True
+
+    async def flush() -> bool:
+        """Wait until the profiles queued so far are in the store; False if any failed to save."""
+        done = asyncio.get_running_loop().create_future()
+        writes.put_nowait(done)
+        return await done
+
+    # The system prompt and tools are sent once as a cached context instead of with every request
+    cache_name = None
+    if not batch and cache_ttl > 0:
+        cache_name = await create_prompt_cache(client, model_name, system_prompt, cache_ttl)
+    cache_args = {"cached_content": cache_name} if cache_name else {}
+
+    async def keep_cache_alive():
+        while True:
+            await asyncio.sleep(cache_ttl / 2)
+            try:
+                await client.aio.caches.update(name=cache_name, config=types.UpdateCachedContentConfig(ttl=f"{int(cache_ttl)}s"))
             except Exception as e:
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                print(f"        [{display_num}] FAILED: {cid} - {error_msg}")
-                async with stats_lock:
-                    stats["failed"] += 1
-                    stats["processed"] += 1
-                    stats["errors"].append({"candidate_id": cid, "error": error_msg})
+                print(f"        Warning: could not extend the context cache: {type(e).__name__}: {e}")
+
+    async def fetch_one(item):
+        display_num, candidate = item
+        print(f"  [{display_num}] PROCESSING: {candidate.get('candidate_id')} - {candidate.get('candidate_name', 'Unknown')}")
+        profile = await call_gemini_api(
+            client=client,
+            candidate=candidate,
+            system_prompt=system_prompt,
+            model_name=model_name,
+            **cache_args,
+        )
+        return profile, profile._token_usage.get("total_token_count") or 0
+
+    def on_retry(item, attempt, error, delay):
+        display_num, candidate = item
+        print(f"        [{display_num}] RETRY {attempt}/{retries} in {delay:.1f}s: "
+              f"{candidate.get('candidate_id')} - {type(error).__name__}: {error}")
 
-    # Run all tasks concurrently (semaphore limits actual parallelism)
-    tasks = [process_one(display_num, candidate) for display_num, candidate in to_process]
-    await asyncio.gather(*tasks)
+    async def on_result(item, result, error):
+        display_num, candidate = item
+        cid = candidate.get("candidate_id")
+        async with stats_lock:
+            stats["processed"] += 1
+            if error is not None:
+                stats["failed"] += 1
+                stats["errors"].append({"candidate_id": cid, "error": f"{type(error).__name__}: {str(error)}"})
+        if error is not None:
+            print(f"        [{display_num}] FAILED: {cid} - {type(error).__name__}: {str(error)}")
+            return
+        usage = result[0]._token_usage
+        message = build_user_message(candidate)
+        async with stats_lock:
+            stats["prompt"]["input_tokens"] += usage.get("prompt_token_count") or 0
+            stats["prompt"]["cached_input_tokens"] += usage.get("cached_content_token_count") or 0
+            stats["prompt"]["input_chars"] += len(system_prompt) + len(message)
+            stats["prompt"]["chars_saved"] += len(build_user_message(candidate, compact=False)) - len(message)
+        writes.put_nowait((result[0].model_dump(), fingerprint(candidate, prompt_hash, model_name)))
+        print(f"        [{display_num}] Fetched: {cid} - {candidate.get('candidate_name', 'Unknown')}")
+
+    limiter = AimdLimiter(
+        initial=min(initial_concurrency, concurrency),
+        maximum=concurrency,
+        latency_target=latency_target,
+    )
+    writer_task = asyncio.create_task(writer())
+    cache_task = asyncio.create_task(keep_cache_alive()) if cache_name else None
+    try:
+        if batch:
+            # Imported here: candidate_profile_batch imports this module
+            from candidate_profile_batch import run_batches
+
+            stats["queue"] = await run_batches(
+                client,
+                to_process,
+                system_prompt=system_prompt,
+                prompt_hash=prompt_hash,
+                model_name=model_name,
+                on_result=on_result,
+                store_path=store_path,
+                flush=flush,
+                batch_size=batch_size,
+                poll_interval=poll_interval,
+            )
+        else:
+            stats["queue"] = await run_queue(
+                to_process,
+                fetch_one,
+                on_result,
+                limiter=limiter,
+                retries=retries,
+                backoff=backoff,
+                retryable=is_retryable,
+                count_tokens=lambda result: result[1],
+                on_retry=on_retry,
+            )
+    finally:
+        # Save whatever was fetched, even if the run is interrupted
+        writes.put_nowait(None)
+        await writer_task
+        if cache_task:
+            cache_task.cancel()
+            await delete_prompt_cache(client, cache_name)
 
     # Print summary
     print("\n" + "=" * 70)
@@ -281,6 +495,20 @@ async def fetch_candidate_profiles(
     print(f"Skipped (existing):  {stats['skipped']}")
     print(f"Successful:          {stats['successful']}")
     print(f"Failed:              {stats['failed']}")
+    queue = stats["queue"]
+    if batch:
+        print(f"Batch jobs:          {queue['jobs']} ({queue['resumed_jobs']} resumed)")
+    else:
+        print(f"Retries:             {queue['retries']}")
+        print(f"Concurrency limit:   {queue['limit']['final']:.1f} "
+              f"(ranged {queue['limit']['lowest']:.1f}-{queue['limit']['highest']:.1f})")
+        print(f"Time in queue:       {format_percentiles(queue['queue_wait'])}")
+        print(f"Request latency:     {format_percentiles(queue['latency'])}")
+    print(f"Tokens:              {queue['tokens']} ({queue['tokens_per_second']:.1f}/s over {queue['seconds']:.1f}s)")
+    prompt = stats["prompt"]
+    print(f"Input tokens:        {prompt['input_tokens']} "
+          f"({prompt['cached_input_tokens']} served from the context cache at the cached rate)")
+    print(f"Input tokens saved:  ~{estimated_tokens_saved(prompt)} by compact payloads ({prompt['chars_saved']} characters)")
 
     if stats["errors"]:
         print(f"\nErrors encountered ({len(stats['errors'])}):")
@@ -292,6 +520,188 @@ async def fetch_candidate_profiles(
     return stats
 
 
+def text_hash(text: str) -> str:
+    """Short sha256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def input_hash(source: dict) -> str:
+    """Hash of a candidate's source data, independent of key order."""
+    return text_hash(json.dumps(source, ensure_ascii=False, sort_keys=True))
+
+
+def fingerprint_source(candidate: dict) -> dict:
+    """
+    The source data a fingerprint covers: the compact payload the model
+    receives (compact_source_data()) without VOLATILE_SOURCE_FIELDS.
+    """
+    source = compact_source_data(candidate)
+    for name in VOLATILE_SOURCE_FIELDS:
+        source.pop(name, None)
+    return source
+
+
+def fingerprint(candidate: dict, prompt_hash: str, model_name: str) -> dict:
+    """What a profile is researched from: the candidate's source data, the prompt and the model."""
+    return {
+        "input": input_hash(fingerprint_source(candidate)),
+        "prompt": prompt_hash,
+        "model": model_name,
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def legacy_input_hashes(candidate: dict) -> set:
+    """
+    Input hashes earlier versions recorded for the same source data: every
+    field of candidate_source_data() with or without the photo URL (which
+    was the remote one, a mirrored site path or empty), or the compact
+    payload with it.
+    """
+    full_source = candidate_source_data(candidate)
+    for name in VOLATILE_SOURCE_FIELDS:
+        full_source.pop(name, None)
+    hashes = {input_hash(full_source)}
+    image_urls = {candidate.get("candidate_image_url", ""), REMOTE_PHOTO_URL.format(candidate.get("candidate_id")), ""}
+    for image_url in image_urls:
+        variant = {**candidate, "candidate_image_url": image_url}
+        hashes.add(input_hash(candidate_source_data(variant)))
+        hashes.add(input_hash(compact_source_data(variant)))
+    return hashes
+
+
+def upgrade_fingerprint(stored: dict, candidate: dict, current: dict) -> bool:
+    """Move a fingerprint recorded in an earlier format to the current input hash; True if it was one."""
+    if stored.get("input") == current["input"] or stored.get("input") not in legacy_input_hashes(candidate):
+        return False
+    stored["input"] = current["input"]
+    return True
+
+
+def refetch_reason(stored: dict, current: dict, max_age_days: Optional[float] = None) -> Optional[str]:
+    """Return why a stored profile is out of date ('input changed', 'stale', ...), or None."""
+    for key, reason in (("input", "input changed"), ("prompt", "prompt changed"), ("model", "model changed")):
+        if stored.get(key) != current[key]:
+            return reason
+    if max_age_days is not None:
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(stored["fetched_at"])
+        if age > timedelta(days=max_age_days):
+            return f"stale, {age.days} days old"
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """work_queue.is_retryable, plus the HTTP transport errors of the GenAI client."""
+    return work_queue.is_retryable(error) or isinstance(error, httpx.TransportError)
+
+
+def format_percentiles(values: dict) -> str:
+    """Format work_queue.percentiles() seconds as 'p50 1.20s, p90 ...'."""
+    return ", ".join(
+        f"{name} {'-' if value is None else f'{value:.2f}s'}" for name, value in values.items()
+    )
+
+
+def estimated_tokens_saved(prompt_stats: dict) -> int:
+    """Tokens the compact payloads saved, at the run's own tokens-per-character rate."""
+    if not prompt_stats["input_chars"]:
+        return 0
+    return round(prompt_stats["chars_saved"] * prompt_stats["input_tokens"] / prompt_stats["input_chars"])
+
+
+def grounding_tool() -> types.Tool:
+    return types.Tool(google_search=types.GoogleSearch())
+
+
+async def create_prompt_cache(client, model_name: str, system_prompt: str, ttl: float) -> Optional[str]:
+    """
+    Register the system prompt and search tool as cached content for this run.
+
+    Returns the cache name, or None when the client or model does not support
+    caching (or the prompt is below the model's minimum cacheable size); the
+    requests then carry the prompt themselves.
+    """
+    try:
+        cache = await client.aio.caches.create(
+            model=model_name,
+            config=types.CreateCachedContentConfig(
+                display_name="candidate-profile-researcher",
+                system_instruction=system_prompt,
+                tools=[grounding_tool()],
+                ttl=f"{int(ttl)}s",
+            ),
+        )
+    except Exception as e:
+        print(f"  Context cache unavailable ({type(e).__name__}: {e}); sending the system prompt with every request")
+        return None
+    print(f"  Context cache: {cache.name}")
+    return cache.name
+
+
+async def delete_prompt_cache(client, cache_name: str):
+    try:
+        await client.aio.caches.delete(name=cache_name)
+    except Exception as e:
+        print(f"Warning: could not delete the context cache {cache_name} (it expires on its own): {e}")
+
+
+def compact_source_data(candidate: dict) -> dict:
+    """
+    candidate_source_data() without the fields that carry nothing: empty
+    values (and the "-" placeholder), false flags (absent means false) and image URLs the model cannot
+    open (site-relative paths of mirrored photos).
+    """
+    data = {}
+    for name, value in candidate_source_data(candidate).items():
+        if value is None or value is False or value in ("", "-") or value == []:
+            continue
+        if name == "candidate_image_url" and not str(value).startswith(("http://", "https://")):
+            continue
+        data[name] = value
+    return data
+
+
+def candidate_source_data(candidate: dict) -> dict:
+    """The fields of a candidate sent to the model as its SOURCE JSON."""
+    return {
+        "candidate_id": candidate.get("candidate_id"),
+        "candidate_name": candidate.get("candidate_name"),
+        "father_name": candidate.get("father_name"),
+        "spouse_name": candidate.get("spouse_name"),
+        "district_name": candidate.get("district_name"),
+        "prev_election_district": candidate.get("prev_election_district"),
+        "prev_election_party": candidate.get("prev_election_party"),
+        "prev_election_result": candidate.get("prev_election_result"),
+        "prev_election_votes": candidate.get("prev_election_votes"),
+        "prev_2074_election_result": candidate.get("prev_2074_election_result"),
+        "prev_2074_election_votes": candidate.get("prev_2074_election_votes"),
+        "political_party_name": candidate.get("political_party_name"),
+        "party_previous_names": candidate.get("party_previous_names", []),
+        "candidate_image_url": candidate.get("candidate_image_url", ""),
+        "is_vaguwa": candidate.get("is_vaguwa", False),
+        "is_tourist_candidate": candidate.get("is_tourist_candidate", False),
+    }
+
+
+def build_user_message(candidate: dict, compact: bool = True) -> str:
+    """
+    The user turn asking the model to research a candidate. compact=False
+    gives the former, indented payload with every field (for comparison).
+    """
+    if compact:
+        source_json = json.dumps(compact_source_data(candidate), ensure_ascii=False, separators=(",", ":"))
+    else:
+        source_json = json.dumps(candidate_source_data(candidate), ensure_ascii=False, indent=2)
+    return f"""
+Here is the SOURCE JSON for the candidate:
+
+{source_json}
+
+Please research and provide the enriched PROFILE JSON following the schema specified in the system prompt.
+Use grounding metadata to populate link_to_source fields with actual web source URLs when available.
+"""
+
+
 def enrich_profile_with_grounding_metadata(
     profile: CandidateProfileResponse,
     grounding_metadata: dict,
@@ -349,6 +759,7 @@ async def call_gemini_api(
     candidate: dict,
     system_prompt: str,
     model_name: str = "gemini-3-flash-preview",
+    cached_content: Optional[str] = None,
 ) -> CandidateProfileResponse:
     """
     Call Gemini API asynchronously with system prompt, Google Search grounding,
@@ -359,56 +770,35 @@ async def call_gemini_api(
         candidate: Candidate dictionary from the JSON file
         system_prompt: System prompt string
         model_name: Model name to use (default: "gemini-3-flash-preview")
+        cached_content: Name of a cache holding the system prompt and tools
+            (see create_prompt_cache); they are then not sent again
 
     Returns:
         CandidateProfileResponse object (already validated by Gemini)
-        with link_to_source fields populated from grounding metadata
+        with link_to_source fields populated from grounding metadata, and the
+        response's token counts in its private `_token_usage` dict
 
     Raises:
         ValueError: If the API returns an error or invalid response
     """
-    # Prepare candidate data (source JSON)
-    candidate_data = {
-        "candidate_id": candidate.get("candidate_id"),
-        "candidate_name": candidate.get("candidate_name"),
-        "father_name": candidate.get("father_name"),
-        "spouse_name": candidate.get("spouse_name"),
-        "district_name": candidate.get("district_name"),
-        "prev_election_district": candidate.get("prev_election_district"),
-        "prev_election_party": candidate.get("prev_election_party"),
-        "prev_election_result": candidate.get("prev_election_result"),
-        "prev_election_votes": candidate.get("prev_election_votes"),
-        "prev_2074_election_result": candidate.get("prev_2074_election_result"),
-        "prev_2074_election_votes": candidate.get("prev_2074_election_votes"),
-        "political_party_name": candidate.get("political_party_name"),
-        "party_previous_names": candidate.get("party_previous_names", []),
-        "candidate_image_url": candidate.get("candidate_image_url", ""),
-        "is_vaguwa": candidate.get("is_vaguwa", False),
-        "is_tourist_candidate": candidate.get("is_tourist_candidate", False),
-    }
-
-    # Create message with system prompt and candidate data
-    user_message = f"""
-Here is the SOURCE JSON for the candidate:
-
-{json.dumps(candidate_data, ensure_ascii=False, indent=2)}
-
-Please research and provide the enriched PROFILE JSON following the schema specified in the system prompt.
-Use grounding metadata to populate link_to_source fields with actual web source URLs when available.
-"""
-
-    # Create Google Search grounding tool
-    grounding_tool = types.Tool(
-        google_search=types.GoogleSearch()
-    )
+    # Create message with the candidate data (source JSON)
+    user_message = build_user_message(candidate)
 
     # Create config with schema enforcement and grounding
-    config = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_schema=CandidateProfileResponse,
-        tools=[grounding_tool],  # Enable Google Search grounding
-        system_instruction=system_prompt,
-    )
+    if cached_content:
+        # The system prompt and the Google Search tool are part of the cache
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=CandidateProfileResponse,
+            cached_content=cached_content,
+        )
+    else:
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=CandidateProfileResponse,
+            tools=[grounding_tool()],  # Enable Google Search grounding
+            system_instruction=system_prompt,
+        )
 
     # Call Gemini API asynchronously
     response = await client.aio.models.generate_content(
@@ -436,6 +826,12 @@ Use grounding metadata to populate link_to_source fields with actual web source
             response.grounding_metadata
         )
 
+    if getattr(response, "usage_metadata", None):
+        validated_profile._token_usage = {
+            name: value for name, value in response.usage_metadata.model_dump().items()
+            if name.endswith("token_count") and isinstance(value, int)
+        }
+
     return validated_profile
 
 
@@ -493,9 +889,19 @@ if __name__ == "__main__":
     parser.add_argument("--limit", type=int, help="Limit the number of candidates to process")
     parser.add_argument("--offset", type=int, default=0, help="Number of candidates to skip from the start (e.g., --offset 50 starts from candidate #51)")
     parser.add_argument("--candidate-id", type=int, help="Fetch details for a specific candidate ID (overrides --offset and --limit)")
-    parser.add_argument("--no-skip", action="store_true", help="Do not skip candidates that already have saved profiles")
+    parser.add_argument("--no-skip", action="store_true", help="Refetch candidates even if their saved profile is up to date")
+    parser.add_argument("--max-age-days", type=float, help="Refetch saved profiles older than this many days (default: no expiry)")
     parser.add_argument("--include-new", action="store_true", help="Include new candidates (is_new_candidate=True) who have no political history")
-    parser.add_argument("--concurrency", type=int, default=30, help="Number of concurrent API requests (default: 30)")
+    parser.add_argument("--concurrency", type=int, default=30, help="Maximum number of concurrent API requests (default: 30)")
+    parser.add_argument("--initial-concurrency", type=int, default=4, help="Concurrent requests to start with; grows while requests succeed (default: 4)")
+    parser.add_argument("--retries", type=int, default=work_queue.RETRIES, help=f"Retries per candidate on rate-limit / server errors (default: {work_queue.RETRIES})")
+    parser.add_argument("--latency-target", type=float, help="Back off when a request takes longer than this many seconds")
+    parser.add_argument("--batch", action="store_true", help="Submit the requests as Gemini batch jobs instead of interactive calls (cheaper, for bulk refreshes)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Requests per batch job (default: 1000)")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between batch job status checks (default: 60)")
+    parser.add_argument("--cache-ttl", type=float, default=3600.0, help="Lifetime in seconds of the cached system prompt, extended while running (default: 3600; 0 disables)")
+    parser.add_argument("--flush-every", type=int, default=20, help="Profiles appended to the store per write (default: 20)")
+    parser.add_argument("--flush-interval", type=float, default=30.0, help="Seconds without new profiles after which a partial batch is written (default: 30)")
 
     argparser = parser.parse_args()
 
@@ -506,8 +912,18 @@ if __name__ == "__main__":
             offset=argparser.offset,
             candidate_id=argparser.candidate_id,
             skip_existing=not argparser.no_skip,
+            max_age_days=argparser.max_age_days,
             include_new_candidates=argparser.include_new,
             concurrency=argparser.concurrency,
+            flush_every=argparser.flush_every,
+            flush_interval=argparser.flush_interval,
+            initial_concurrency=argparser.initial_concurrency,
+            retries=argparser.retries,
+            latency_target=argparser.latency_target,
+            batch=argparser.batch,
+            batch_size=argparser.batch_size,
+            poll_interval=argparser.poll_interval,
+            cache_ttl=argparser.cache_ttl,
         ))
         sys.exit(0 if stats["failed"] == 0 else 1)
     except Exception as e:
@@ -36,9 +36,9 @@ export function CandidatePreviewCard({ candidate, onClick }: CandidatePreviewCar
       <div className="flex items-start gap-3 p-4">
         {/* Candidate image */}
         <div className="relative h-16 w-16 shrink-0 overflow-hidden rounded-lg bg-secondary">
-          {candidate.candidate_image_url && !imgError ? (
+          {(candidate.candidate_image_small_url || candidate.candidate_image_url) && !imgError ? (
             <Image
-              src={candidate.candidate_image_url}
+              src={candidate.candidate_image_small_url || candidate.candidate_image_url}
               alt={candidate.candidate_name}
               fill
               className="object-cover"
@@ -16,7 +16,8 @@ interface ProfileHeaderProps {
 export function ProfileHeader({ candidate }: ProfileHeaderProps) {
   const [imageError, setImageError] = useState(false)
   const [symbolError, setSymbolError] = useState(false)
-  const candidateImageUrl = `https://result.election.gov.np/Images/Candidate/${candidate.candidate_id}.jpg`
+  const candidateImageUrl =
+    candidate.candidate_image_url || `https://result.election.gov.np/Images/Candidate/${candidate.candidate_id}.jpg`
   const { getSymbolUrl } = usePartySymbols()
   const partySymbolUrl = getSymbolUrl(candidate.political_party_name)
   const { data: politicalHistory } = usePoliticalHistory(candidate.candidate_id)
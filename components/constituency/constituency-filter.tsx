@@ -3,35 +3,32 @@
 import { useState, useEffect, useMemo } from "react"
 import { ChevronDown, Search, MapPin, Building2, Vote, Loader2 } from "lucide-react"
 import { cn } from "@/lib/utils"
-import { useJsonData } from "@/hooks/use-json-data"
+import { useShardIndex } from "@/hooks/use-json-data"
 import type { ConstituencyFilterState } from "@/lib/filter-types"
 
-interface ConstituencyData {
+// A constituency as listed in the shard index: the key of its shard and its names
+export interface ConstituencySelection {
   state_id: number
   state_name: string
   district_id: number
   district_name: string
   constituency_id: string
   constituency_name: string
-  fptp_2079_results: any
-  fptp_2074_results: any
-  proportional_2079_results: any
-  winning_party_2079: string
-  winning_party_2074: string
-  [key: string]: any
 }
 
 interface ConstituencyFilterProps {
-  onSelect: (constituency: ConstituencyData | null) => void
+  onSelect: (constituency: ConstituencySelection | null) => void
   urlState: ConstituencyFilterState
   onUrlStateChange: (updates: Partial<ConstituencyFilterState>) => void
 }
 
 export function ConstituencyFilter({ onSelect, urlState, onUrlStateChange }: ConstituencyFilterProps) {
 
-  // Load all constituencies from JSON
-  const { data: allConstituencies, loading: dataLoading } = useJsonData<ConstituencyData>(
-    'dim_constituency_profile'
+  // List the constituencies from the shard index instead of loading the full table
+  const { shards, loading: dataLoading } = useShardIndex('dim_constituency_profile', 'by_constituency')
+  const allConstituencies = useMemo(
+    () => shards?.map((shard) => ({ ...shard.key, ...shard.labels }) as unknown as ConstituencySelection) ?? null,
+    [shards]
   )
 
   // Extract unique states
@@ -209,6 +209,22 @@ fptp_2074_stats as (
     group by state_id, district_id, constituency_id
 ),
 
+-- Live count summary of the current election. live_counts.py recomputes
+-- these (same definitions) for changed constituencies between rebuilds.
+current_counts as (
+    select
+        state_id,
+        district_id,
+        constituency_id,
+        sum(current_vote_received) as current_total_votes,
+        min(candidate_id) filter (where current_rank = 1) as current_leading_candidate_id,
+        arg_min(political_party_name, candidate_id) filter (where current_rank = 1) as current_leading_party,
+        cast(max(current_margin) filter (where current_rank = 1) as double)
+            / nullif(sum(current_vote_received), 0) as current_lead_margin
+    from {{ ref('dim_current_fptp_candidates') }}
+    group by state_id, district_id, constituency_id
+),
+
 -- Join all data together
 joined as (
     select
@@ -287,7 +303,13 @@ joined as (
             else false
         end as is_pakad,
 
-        p.symbol_url as winning_party_symbol_url
+        p.symbol_url as winning_party_symbol_url,
+
+        -- Live counts
+        cc.current_total_votes,
+        cc.current_leading_candidate_id,
+        cc.current_leading_party,
+        cc.current_lead_margin
 
     from unique_constituencies uc
     left join fptp_2079_json f79
@@ -310,6 +332,10 @@ joined as (
         on uc.constituency_id = s74.constituency_id
         and uc.state_id = s74.state_id
         and uc.district_id = s74.district_id
+    left join current_counts cc
+        on uc.constituency_id = cc.constituency_id
+        and uc.state_id = cc.state_id
+        and uc.district_id = cc.district_id
     left join parties p
         on s79.winning_party_2079 = p.current_party_name
         or list_contains(p.previous_names, s79.winning_party_2079)
@@ -364,7 +390,13 @@ select
     is_pakad,
     
     -- Tags
-    tags
+    tags,
+
+    -- Live counts
+    current_total_votes,
+    current_leading_candidate_id,
+    current_leading_party,
+    current_lead_margin
     
 from with_tags
 order by state_id, district_id, constituency_id
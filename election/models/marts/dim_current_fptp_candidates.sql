@@ -29,6 +29,11 @@ candidates_political_history as (
     select * from {{ ref('stg_candidates_political_history') }}
 ),
 
+-- Photos mirrored locally by mirror_candidate_photos.py
+candidate_photos as (
+    select * from {{ ref('stg_candidate_photos') }}
+),
+
 -- Address to district mapping (Basobas Jilla)
 address_to_district as (
     select * from {{ ref('stg_candidate_address_to_district_mapping') }}
@@ -841,12 +846,41 @@ select
         ],
         x -> x is not null
     ) as tags,
-    concat('https://result.election.gov.np/Images/Candidate/', cast(candidate_id as varchar), '.jpg') as candidate_image_url,
+    -- Local WebP variants when mirrored, else the election commission's photo
+    coalesce(
+        photo_medium_path,
+        concat('https://result.election.gov.np/Images/Candidate/', cast(candidate_id as varchar), '.jpg')
+    ) as candidate_image_url,
+    coalesce(
+        photo_small_path,
+        concat('https://result.election.gov.np/Images/Candidate/', cast(candidate_id as varchar), '.jpg')
+    ) as candidate_image_small_url,
     concat('https://result.election.gov.np/CandidateDetail.aspx?id=', cast(candidate_id as varchar)) as candidate_profile_url,
     dp.party_id as party_id,
     dp.symbol_url as party_symbol_url,
-    dp.party_display_order
+    dp.party_display_order,
+
+    -- Live count standing within the constituency. live_counts.py recomputes
+    -- these (same definitions) for changed constituencies between rebuilds.
+    case
+        when sum(current_vote_received) over constituency_window > 0
+            then rank() over (partition by state_id, district_id, constituency_id order by current_vote_received desc)
+    end as current_rank,
+    cast(current_vote_received as double) / nullif(sum(current_vote_received) over constituency_window, 0) as current_vote_share,
+    -- Lead over the best other candidate (negative when trailing)
+    case
+        when sum(current_vote_received) over constituency_window > 0
+            then current_vote_received - coalesce(max(current_vote_received) over other_candidates_window, 0)
+    end as current_margin,
+    case
+        -- E_STATUS is only set once the winner is declared (like Remarks = 'Elected' in 2079)
+        when election_status is not null then 'won'
+        when sum(current_vote_received) over constituency_window = 0 then null
+        when current_vote_received = max(current_vote_received) over constituency_window then 'leading'
+        else 'trailing'
+    end as current_count_status
 from (select distinct on (candidate_id) * from with_tags) with_tags
+left join candidate_photos using (candidate_id)
 left join lateral (
     select *
     from dim_parties p
@@ -863,3 +897,9 @@ left join lateral (
         end
     limit 1
 ) dp on true
+window
+    constituency_window as (partition by state_id, district_id, constituency_id),
+    other_candidates_window as (
+        partition by state_id, district_id, constituency_id
+        rows between unbounded preceding and unbounded following exclude current row
+    )
@@ -175,8 +175,11 @@ select
     ap.norm_previous_names,
     ph.is_new_party,
     ph.total_prev_candidates,
-    ps.symbol_url,
+    -- Local thumbnail when the scraper downloaded it, else the remote image
+    coalesce(ps.symbol_path, ps.symbol_url) as symbol_url,
     ps.symbol_alt,
+    ps.symbol_width,
+    ps.symbol_height,
     ps.leader,
     ps.founded_year,
     ps.party_url as wikipedia_url,
@@ -195,7 +198,10 @@ left join (
     select
         pv.current_party_name,
         ps.symbol_url,
+        ps.symbol_path,
         ps.symbol_alt,
+        ps.symbol_width,
+        ps.symbol_height,
         ps.leader,
         ps.founded_year,
         ps.party_url,
@@ -0,0 +1,20 @@
+{{ config(materialized='view') }}
+
+with source as (
+    select * from {{ source('raw', 'candidate_photos') }}
+),
+
+renamed as (
+    select
+        candidate_id,
+        sha256 as photo_sha256,
+        small_path as photo_small_path,
+        small_width as photo_small_width,
+        small_height as photo_small_height,
+        medium_path as photo_medium_path,
+        medium_width as photo_medium_width,
+        medium_height as photo_medium_height
+    from source
+)
+
+select * from renamed
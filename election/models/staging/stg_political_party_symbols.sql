@@ -11,6 +11,9 @@ renamed as (
         party_url,
         symbol_url,
         symbol_alt,
+        symbol_path,
+        symbol_width,
+        symbol_height,
         leader,
         founded_year
     from source
@@ -1,96 +1,597 @@
 #!/usr/bin/env python3
 """Export dim tables to JSON files for frontend use."""
 
+import argparse
+import gzip
+import hashlib
 import json
+import queue
+import shutil
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import brotli
 import duckdb
-import numpy as np
-import pandas as pd
+import pyarrow as pa
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SOURCE_DB = os.path.join(SCRIPT_DIR, "election", "election.db")
 OUTPUT_DIR = os.path.join(SCRIPT_DIR, "public", "data")
 
+# Per-table fingerprints of the exported files, read by the frontend
+MANIFEST_FILE = "manifest.json"
+
+# Rows fetched from DuckDB per round-trip while writing a JSON file
+BATCH_SIZE = 2048
+
+# Quality 11 is ~50x slower on the candidate tables for ~10% smaller files
+BROTLI_QUALITY = 9
+
+# Per-constituency files, so a page can load one shard instead of the
+# national table: {source_table: [(shard_name, partition_columns)]}
+SHARDS = {
+    'dim_current_fptp_candidates': [
+        ("by_constituency", ("state_id", "district_id", "constituency_id")),
+    ],
+    'dim_constituency_profile': [
+        ("by_constituency", ("state_id", "district_id", "constituency_id")),
+    ],
+}
+# Columns copied into every shard's index entry, so a picker can list the
+# shards from shards/index.json without loading the table
+SHARD_LABELS = {
+    'dim_constituency_profile': ("state_name", "district_name", "constituency_name"),
+}
+SHARDS_DIR = "shards"
+SHARD_INDEX_FILE = "index.json"
+
+# Typed Parquet / Arrow IPC copies of every table, for notebooks and analysts
+PARQUET_DIR = "parquet"
+ARROW_DIR = "arrow"
+
+# Large tables that can also be exported column-wise (--columnar)
+COLUMNAR_TABLES = {
+    'dim_current_fptp_candidates',
+    'dim_current_proportional_candidates',
+}
+
+# Tables to export: (source_table, output_name)
+# Use tuples when the output filename differs from the source table name
+TABLES = [
+    'dim_current_fptp_candidates',
+    'dim_current_proportional_candidates',
+    'dim_parties',
+    'dim_constituency_profile',
+    'dim_parties_profile',
+    'political_party_symbols',
+    ("stg_candidates_political_history", "candidates_political_history"),
+]
+
+
+def table_entries(tables=TABLES):
+    """Yield (source_table, output_name) pairs for the TABLES entries."""
+    for entry in tables:
+        if isinstance(entry, tuple):
+            yield entry
+        else:
+            yield entry, entry
 
-def convert_value(val):
-    """Convert a value to JSON-serializable format."""
-    # Handle numpy arrays
-    if isinstance(val, np.ndarray):
-        return val.tolist()
-    # Handle pandas NA
-    if pd.isna(val):
-        return None
-    # Handle numpy types
-    if isinstance(val, (np.integer, np.int64, np.int32)):
-        return int(val)
-    if isinstance(val, (np.floating, np.float64, np.float32)):
-        return None if np.isnan(val) else float(val)
-    if isinstance(val, np.bool_):
-        return bool(val)
-    return val
-
-
-def export_table_to_json(db_path: str, table_name: str, output_file: str):
-    """Export a DuckDB table to JSON file."""
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for use in DuckDB SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def json_select_list(con, table_name: str) -> str:
+    """
+    Build the SELECT list used to serialize a table with DuckDB's to_json.
+
+    Keeps the output identical to the old pandas exporter: JSON columns are
+    written as strings (pandas read them as text) and NaN doubles become null.
+    """
+    columns = []
+    for name, column_type, *_ in con.execute(f"DESCRIBE {table_name}").fetchall():
+        column = quote_identifier(name)
+        if column_type == "JSON":
+            columns.append(f"{column}::VARCHAR AS {column}")
+        elif column_type in ("DOUBLE", "FLOAT"):
+            columns.append(f"CASE WHEN isnan({column}) THEN NULL ELSE {column} END AS {column}")
+        else:
+            columns.append(column)
+    return ", ".join(columns)
+
+
+def table_fingerprint(con, table_name: str, select_list: str) -> str:
+    """
+    Compute a content fingerprint of a table inside DuckDB.
+
+    Sums the hash of every row's exported JSON text (a streaming aggregate,
+    so the table is never materialized), then folds in the row count.
+    """
+    row_count, hash_sum = con.execute(f"""
+        SELECT count(*), coalesce(sum(hash(to_json(r)::VARCHAR)::HUGEINT), 0)
+        FROM (SELECT {select_list} FROM {table_name}) r
+    """).fetchone()
+    return hashlib.sha256(f"{row_count}:{hash_sum}".encode()).hexdigest()[:16]
+
+
+def load_manifest(output_dir: str) -> dict:
+    """Load the manifest of the previous export, or {} if there is none."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
     try:
-        con = duckdb.connect(db_path, read_only=True)
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(output_dir: str, manifest: dict):
+    """Write the manifest atomically so readers never see a partial file."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def stream_table_to_json(con, table_name: str, select_list: str, output_file: str) -> int:
+    """
+    Let DuckDB write the JSON array itself with COPY.
+
+    Rows are serialized and written in chunks inside DuckDB, so memory use
+    stays flat however large the table grows.
+    """
+    output_path = output_file.replace("'", "''")
+    return con.execute(
+        f"COPY (SELECT {select_list} FROM {table_name}) "
+        f"TO '{output_path}' (FORMAT JSON, ARRAY true)"
+    ).fetchone()[0]
+
+
+def minify_json_file(input_file: str, output_file: str):
+    """
+    Write a whitespace-free copy of an exported JSON array.
+
+    Both writers put one record per line (newlines inside values are
+    escaped), so stripping each line minifies the file without parsing it.
+    """
+    with open(input_file, 'r', encoding='utf-8') as src, open(output_file, 'w', encoding='utf-8') as dst:
+        for line in src:
+            dst.write(line.strip())
+
+
+def compress_file(path: str):
+    """Write pre-compressed .gz and .br siblings of a file, chunk by chunk."""
+    # mtime=0 keeps the .gz byte-identical when the content is unchanged
+    with open(path, 'rb') as src, open(f"{path}.gz", 'wb') as raw:
+        with gzip.GzipFile(filename="", mode='wb', fileobj=raw, compresslevel=9, mtime=0) as dst:
+            shutil.copyfileobj(src, dst)
+
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    with open(path, 'rb') as src, open(f"{path}.br", 'wb') as dst:
+        for chunk in iter(lambda: src.read(1 << 20), b''):
+            dst.write(compressor.process(chunk))
+        dst.write(compressor.finish())
+
+
+def write_columnar_json(con, table_name: str, select_list: str, output_file: str):
+    """
+    Write a table as {column_name: [value, ...]} so keys are not repeated per row.
+
+    All columns are aggregated in the same row order (the order of the
+    row-wise file), so index i of every array belongs to the same record.
+    """
+    columns = [quote_identifier(name) for name, *_ in con.execute(f"DESCRIBE {table_name}").fetchall()]
+    lists = ", ".join(f"{column} := coalesce(list({column} ORDER BY __row), [])" for column in columns)
+    payload = con.execute(f"""
+        SELECT to_json(struct_pack({lists}))::VARCHAR
+        FROM (SELECT row_number() OVER () AS __row, {select_list} FROM {table_name})
+    """).fetchone()[0]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(payload)
+
+
+def write_typed_exports(con, table_name: str, parquet_file: str, arrow_file: str):
+    """
+    Write a table as Parquet (zstd) and as an Arrow IPC file, keeping its types.
+
+    Unlike the JSON files, columns keep their DuckDB types and nested
+    list/struct columns stay nested. The Arrow file is not compressed so it
+    can be memory-mapped and read without copying.
+    """
+    for path in (parquet_file, arrow_file):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    parquet_path = parquet_file.replace("'", "''")
+    con.execute(f"COPY (SELECT * FROM {table_name}) TO '{parquet_path}' (FORMAT PARQUET, COMPRESSION zstd)")
+
+    # Stream record batches into the IPC file instead of building one table
+    reader = pa.RecordBatchReader.from_stream(con.execute(f"SELECT * FROM {table_name}").arrow())
+    with pa.OSFile(arrow_file, 'wb') as sink, pa.ipc.new_file(sink, reader.schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+
+def variant_files(output_name: str, columnar: bool = False) -> dict:
+    """Return {variant: filename} of the compact files written next to <output_name>.json."""
+    variants = {
+        "min": f"{output_name}.min.json",
+        "min_gzip": f"{output_name}.min.json.gz",
+        "min_brotli": f"{output_name}.min.json.br",
+    }
+    if columnar:
+        variants.update({
+            "columnar": f"{output_name}.columns.json",
+            "columnar_gzip": f"{output_name}.columns.json.gz",
+            "columnar_brotli": f"{output_name}.columns.json.br",
+        })
+    variants.update({
+        "parquet": f"{PARQUET_DIR}/{output_name}.parquet",
+        "arrow": f"{ARROW_DIR}/{output_name}.arrow",
+    })
+    return variants
+
+
+def write_compact_variants(con, table_name: str, select_list: str, output_dir: str, output_name: str,
+                           columnar: bool = False) -> dict:
+    """
+    Write the minified, gzip and brotli variants of an exported table, the
+    columnar layout if requested, and the typed Parquet / Arrow copies.
+    Returns {variant: filename}.
+    """
+    variants = variant_files(output_name, columnar)
+    min_file = os.path.join(output_dir, variants["min"])
+    minify_json_file(os.path.join(output_dir, f"{output_name}.json"), min_file)
+    compress_file(min_file)
+    if columnar:
+        columnar_file = os.path.join(output_dir, variants["columnar"])
+        write_columnar_json(con, table_name, select_list, columnar_file)
+        compress_file(columnar_file)
+    write_typed_exports(
+        con, table_name,
+        os.path.join(output_dir, variants["parquet"]),
+        os.path.join(output_dir, variants["arrow"]),
+    )
+    return variants
 
-        # Read table and convert to pandas DataFrame
-        df = con.execute(f"SELECT * FROM {table_name}").df()
 
-        # Convert to records with proper type handling
-        data = []
-        for _, row in df.iterrows():
-            record = {}
-            for col in df.columns:
-                record[col] = convert_value(row[col])
-            data.append(record)
+def shard_file_name(key: dict) -> str:
+    """File name of a shard, e.g. {state_id: 1, district_id: 4, constituency_id: 2} -> '1-4-2.json'."""
+    parts = ["null" if value is None else str(value) for value in key.values()]
+    return "-".join(part.replace("/", "_") for part in parts) + ".json"
 
-        # Write to JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
 
+def write_table_shards(con, table_name: str, select_list: str, output_dir: str, output_name: str,
+                       where: str = None, shard_names=None) -> dict:
+    """
+    Write the shards of a table listed in SHARDS.
+
+    Each sharding is one DuckDB query that groups the rows by the partition
+    columns and builds every shard's JSON array with string_agg, so Python
+    only writes the files (no query per shard). Old shards of the table are
+    removed first so partitions that disappeared do not linger.
+
+    With `where` (a condition on the table's columns) only the shards of the
+    matching rows are rewritten, in place; `shard_names` limits the
+    shardings written. Files are replaced atomically either way.
+
+    Returns {shard_name: {"partition_by": [...], "shards": [{key, rows, file}]}};
+    shards of tables in SHARD_LABELS also carry their "labels".
+    """
+    table_dir = os.path.join(output_dir, SHARDS_DIR, output_name)
+    if where is None:
+        shutil.rmtree(table_dir, ignore_errors=True)
+
+    index = {}
+    for shard_name, partition_by in SHARDS.get(table_name, []):
+        if shard_names is not None and shard_name not in shard_names:
+            continue
+        shard_dir = os.path.join(table_dir, shard_name)
+        os.makedirs(shard_dir, exist_ok=True)
+        keys = ", ".join(quote_identifier(column) for column in partition_by)
+        labels = SHARD_LABELS.get(table_name, ())
+        label_values = "".join(f"any_value({quote_identifier(column)}), " for column in labels)
+        cursor = con.execute(f"""
+            SELECT {keys}, {label_values}count(*),
+                   '[' || chr(10) || string_agg(row_json, ',' || chr(10) ORDER BY __row) || chr(10) || ']' || chr(10)
+            FROM (
+                SELECT row_number() OVER () AS __row, to_json(r)::VARCHAR AS row_json,
+                       {", ".join(f"r.{quote_identifier(column)}" for column in (*partition_by, *labels))}
+                FROM (SELECT {select_list} FROM {table_name}{f" WHERE {where}" if where else ""}) r
+            )
+            GROUP BY {keys}
+            ORDER BY {keys}
+        """)
+
+        shards = []
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            for *values, row_count, payload in batch:
+                key = dict(zip(partition_by, values))
+                label = dict(zip(labels, values[len(partition_by):]))
+                file_name = shard_file_name(key)
+                shard_path = os.path.join(shard_dir, file_name)
+                with open(f"{shard_path}.tmp", 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(f"{shard_path}.tmp", shard_path)
+                shard = {
+                    "key": key,
+                    "rows": row_count,
+                    "file": f"{SHARDS_DIR}/{output_name}/{shard_name}/{file_name}",
+                }
+                if labels:
+                    shard["labels"] = label
+                shards.append(shard)
+        index[shard_name] = {"partition_by": list(partition_by), "shards": shards}
+    return index
+
+
+def load_shard_index(output_dir: str) -> dict:
+    """Load the shard index of the previous export, or {} if there is none."""
+    index_path = os.path.join(output_dir, SHARDS_DIR, SHARD_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_shard_index(output_dir: str, index: dict):
+    """Write the shard index (minified, it lists every shard) atomically."""
+    index_path = os.path.join(output_dir, SHARDS_DIR, SHARD_INDEX_FILE)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, index_path)
+
+
+def print_size_report(output_dir: str, results: dict):
+    """Print the size of every exported file and its compact variants in KB."""
+    labels = ["json", "min", "min_gzip", "min_brotli", "columnar", "columnar_gzip", "columnar_brotli",
+              "parquet", "arrow"]
+    header = f"  {'table':<40}" + "".join(f"{label:>16}" for label in labels)
+    print("\nSize report (KB):")
+    print(header)
+    for output_name, result in results.items():
+        if not result["hash"]:
+            continue
+        files = {"json": f"{output_name}.json", **result["variants"]}
+        sizes = []
+        for label in labels:
+            path = os.path.join(output_dir, files[label]) if label in files else None
+            sizes.append(f"{os.path.getsize(path) / 1024:>16.1f}" if path and os.path.exists(path) else f"{'-':>16}")
+        print(f"  {output_name:<40}" + "".join(sizes))
+
+
+def write_table_to_json(con, table_name: str, output_file: str, stream: bool = False) -> int:
+    """Write one table to a JSON file over an open connection; returns the row count."""
+    select_list = json_select_list(con, table_name)
+    if stream:
+        return stream_table_to_json(con, table_name, select_list, output_file)
+
+    # DuckDB serializes every row (including nested lists and structs) to
+    # JSON text; Python only joins the rows of each batch
+    cursor = con.execute(
+        f"SELECT to_json(r)::VARCHAR FROM (SELECT {select_list} FROM {table_name}) r"
+    )
+
+    # Write a JSON array with one record per line
+    row_count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("[")
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            f.write(",\n" if row_count else "\n")
+            f.write(",\n".join(row[0] for row in batch))
+            row_count += len(batch)
+        f.write("\n]\n" if row_count else "]\n")
+    return row_count
+
+
+def export_table_to_json(db_path: str, table_name: str, output_file: str, stream: bool = False):
+    """
+    Export a DuckDB table to JSON file.
+
+    With stream=True the file is written by DuckDB's COPY instead of batches
+    fetched into Python (constant memory, for large tables).
+    """
+    try:
+        con = duckdb.connect(db_path, read_only=True)
+        row_count = write_table_to_json(con, table_name, output_file, stream=stream)
         con.close()
-        print(f"✓ Exported {len(data)} rows from {table_name} to {output_file}")
-        return len(data)
+        print(f"✓ Exported {row_count} rows from {table_name} to {output_file}")
+        return row_count
     except Exception as e:
         print(f"✗ Error exporting {table_name}: {e}")
         import traceback
         traceback.print_exc()
         return 0
 
+
+class ReadOnlyConnectionPool:
+    """
+    Cursors over a single read-only DuckDB connection, shared by worker threads.
+
+    All cursors use the same database instance, so the file is opened once
+    and each thread gets its own cursor for the duration of an export.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        self._con = duckdb.connect(db_path, read_only=True)
+        self._cursors = queue.Queue()
+        for _ in range(size):
+            self._cursors.put(self._con.cursor())
+
+    @contextmanager
+    def connection(self):
+        cursor = self._cursors.get()
+        try:
+            yield cursor
+        finally:
+            self._cursors.put(cursor)
+
+    def close(self):
+        while not self._cursors.empty():
+            self._cursors.get().close()
+        self._con.close()
+
+
+def export_tables(
+    db_path: str,
+    output_dir: str,
+    tables=TABLES,
+    workers: int = 1,
+    stream: bool = False,
+    force: bool = False,
+    columnar: bool = False,
+) -> dict:
+    """
+    Export tables concurrently on a thread pool with pooled connections.
+
+    Every table also gets minified, gzip and brotli variants, tables in
+    COLUMNAR_TABLES a columnar file when columnar=True, and tables in SHARDS
+    their per-constituency shards (listed in shards/index.json). Tables whose
+    fingerprint matches the manifest of the previous run (and whose files
+    still exist) are not rewritten unless force=True. The manifest is
+    updated with the new fingerprints and variant files.
+
+    Returns {output_name: {"rows", "seconds", "hash", "written", "variants",
+    "shards"}} in the order of `tables`.
+    """
+    manifest = load_manifest(output_dir)
+    shard_index = load_shard_index(output_dir)
+    pool = ReadOnlyConnectionPool(db_path, workers)
+
+    def export_one(table: str, output_name: str):
+        output_file = os.path.join(output_dir, f"{output_name}.json")
+        previous = manifest.get(output_name, {})
+        with_columns = columnar and table in COLUMNAR_TABLES
+        expected_files = [f"{output_name}.json", *variant_files(output_name, with_columns).values()]
+        expected_shards = [shard_name for shard_name, _ in SHARDS.get(table, [])]
+        start = time.perf_counter()
+        result = {"rows": 0, "hash": None, "written": False, "variants": {}, "shards": {}}
+        try:
+            with pool.connection() as con:
+                select_list = json_select_list(con, table)
+                result["hash"] = table_fingerprint(con, table, select_list)
+                unchanged = (
+                    not force
+                    and previous.get("hash") == result["hash"]
+                    and previous.get("variants") == variant_files(output_name, with_columns)
+                    and all(os.path.exists(os.path.join(output_dir, name)) for name in expected_files)
+                    and [name for name in shard_index.get(output_name, {}) if name != "hash"] == expected_shards
+                )
+                if unchanged:
+                    result["rows"] = previous.get("rows", 0)
+                    result["variants"] = previous["variants"]
+                    result["shards"] = {
+                        name: shards for name, shards in shard_index.get(output_name, {}).items() if name != "hash"
+                    }
+                    print(f"= Unchanged {table} ({result['hash']}), keeping {output_file}")
+                else:
+                    result["rows"] = write_table_to_json(con, table, output_file, stream=stream)
+                    result["variants"] = write_compact_variants(
+                        con, table, select_list, output_dir, output_name, columnar=with_columns
+                    )
+                    result["shards"] = write_table_shards(con, table, select_list, output_dir, output_name)
+                    result["written"] = True
+                    print(f"✓ Exported {result['rows']} rows from {table} to {output_file}")
+        except Exception as e:
+            print(f"✗ Error exporting {table}: {e}")
+            import traceback
+            traceback.print_exc()
+            result["hash"] = None
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    try:
+        # DuckDB releases the GIL while it runs a query, so threads overlap
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                output_name: executor.submit(export_one, table, output_name)
+                for table, output_name in table_entries(tables)
+            }
+        results = {output_name: future.result() for output_name, future in futures.items()}
+    finally:
+        pool.close()
+
+    exported_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    new_manifest = dict(manifest)
+    for (table, output_name), result in zip(table_entries(tables), results.values()):
+        if result["hash"] is None:
+            # Failed exports may have left a partial file; force a rewrite next run
+            new_manifest.pop(output_name, None)
+        elif result["written"] or output_name not in manifest:
+            new_manifest[output_name] = {
+                "file": f"{output_name}.json",
+                "table": table,
+                "rows": result["rows"],
+                "hash": result["hash"],
+                "variants": result["variants"],
+                "exported_at": exported_at,
+            }
+    if new_manifest != manifest:
+        save_manifest(output_dir, new_manifest)
+
+    # Tables not exported in this run keep their entries
+    new_shard_index = dict(shard_index)
+    for output_name, result in results.items():
+        if result["shards"] and result["hash"] is not None:
+            new_shard_index[output_name] = {"hash": result["hash"], **result["shards"]}
+        else:
+            new_shard_index.pop(output_name, None)
+    if new_shard_index != shard_index:
+        save_shard_index(output_dir, new_shard_index)
+
+    return results
+
+
 def main():
     """Export all required tables."""
+    parser = argparse.ArgumentParser(description="Export dim tables to JSON files for the frontend.")
+    parser.add_argument("--stream", action="store_true", help="Let DuckDB stream each file to disk (constant memory)")
+    parser.add_argument("--workers", type=int, default=min(len(TABLES), os.cpu_count() or 1),
+                        help="Tables exported in parallel (default: one per table, up to the CPU count)")
+    parser.add_argument("--force", action="store_true", help="Rewrite every file even if its fingerprint is unchanged")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Also write column-wise files for the large candidate tables")
+    args = parser.parse_args()
+
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    print(f"Output directory: {OUTPUT_DIR}\n")
-
-    # Tables to export: (source_table, output_name)
-    # Use tuples when the output filename differs from the source table name
-    tables = [
-        'dim_current_fptp_candidates',
-        'dim_current_proportional_candidates',
-        'dim_parties',
-        'dim_constituency_profile',
-        'dim_parties_profile',
-        'political_party_symbols',
-        ("stg_candidates_political_history", "candidates_political_history"),
-    ]
-
-    total_rows = 0
-    for entry in tables:
-        if isinstance(entry, tuple):
-            table, output_name = entry
-        else:
-            table = output_name = entry
-        output_file = os.path.join(OUTPUT_DIR, f"{output_name}.json")
-        rows = export_table_to_json(SOURCE_DB, table, output_file)
-        total_rows += rows
+    print(f"Output directory: {OUTPUT_DIR}")
+    print(f"Workers: {args.workers}\n")
+
+    start = time.perf_counter()
+    results = export_tables(SOURCE_DB, OUTPUT_DIR, workers=args.workers, stream=args.stream, force=args.force,
+                            columnar=args.columnar)
+    wall_time = time.perf_counter() - start
 
-    print(f"\nTotal: {total_rows} rows exported")
+    print("\nPer-table wall time:")
+    for output_name, result in results.items():
+        status = "written" if result["written"] else "unchanged" if result["hash"] else "failed"
+        print(f"  {output_name:<40} {result['rows']:>7} rows  {result['seconds']:>7.3f}s  {status}")
+
+    total_rows = sum(result["rows"] for result in results.values() if result["written"])
+    unchanged = sum(1 for result in results.values() if result["hash"] and not result["written"])
+    print(f"\nTotal: {total_rows} rows exported in {wall_time:.3f}s "
+          f"(sum of per-table times: {sum(result['seconds'] for result in results.values()):.3f}s)")
+    print(f"Unchanged tables skipped: {unchanged}")
+    print_size_report(OUTPUT_DIR, results)
     print(f"JSON files ready in: {OUTPUT_DIR}")
 
 if __name__ == "__main__":
     main()
-
@@ -1,5 +1,66 @@
 import { useState, useEffect } from 'react';
 
+interface ManifestEntry {
+  file: string;
+  table: string;
+  rows: number;
+  hash: string;
+  variants?: Record<string, string>;
+  exported_at: string;
+}
+
+let manifestPromise: Promise<Record<string, ManifestEntry>> | null = null;
+
+// The manifest is small and always revalidated; the data files it points to
+// are versioned by their content hash so they can be cached long-term
+function loadManifest(): Promise<Record<string, ManifestEntry>> {
+  if (!manifestPromise) {
+    manifestPromise = fetch('/data/manifest.json', { cache: 'no-cache' })
+      .then((response) => (response.ok ? response.json() : {}))
+      .catch(() => ({}));
+  }
+  return manifestPromise;
+}
+
+export async function dataUrl(
+  filename: string,
+  variant: 'min' | 'columnar' = 'min'
+): Promise<string> {
+  const manifest = await loadManifest();
+  const entry = manifest[filename];
+  if (!entry) {
+    return `/data/${filename}.json`;
+  }
+  const file = entry.variants?.[variant] ?? entry.file;
+  return `/data/${file}?v=${entry.hash}`;
+}
+
+// Columnar files store { column: [values...] }; rebuild the row objects
+function rowsFromColumns<T>(columns: Record<string, unknown[]>): T[] {
+  const names = Object.keys(columns);
+  const rowCount = names.length ? columns[names[0]].length : 0;
+  const rows = new Array<T>(rowCount);
+  for (let i = 0; i < rowCount; i++) {
+    const row: Record<string, unknown> = {};
+    for (const name of names) {
+      row[name] = columns[name][i];
+    }
+    rows[i] = row as T;
+  }
+  return rows;
+}
+
+async function fetchRows<T>(filename: string): Promise<T[]> {
+  const manifest = await loadManifest();
+  const columnar = Boolean(manifest[filename]?.variants?.columnar);
+  const response = await fetch(await dataUrl(filename, columnar ? 'columnar' : 'min'));
+  if (!response.ok) {
+    throw new Error(`Failed to load ${filename}: ${response.status}`);
+  }
+  const payload = await response.json();
+  return columnar ? rowsFromColumns<T>(payload) : payload;
+}
+
 export function useJsonData<T>(
   filename: string,
   filterFn?: (items: T[]) => T[]
@@ -13,12 +74,7 @@ export function useJsonData<T>(
 
     const loadData = async () => {
       try {
-        const response = await fetch(`/data/${filename}.json`);
-        if (!response.ok) {
-          throw new Error(`Failed to load ${filename}: ${response.status}`);
-        }
-
-        let items = await response.json();
+        let items = await fetchRows<T>(filename);
 
         // Apply filter if provided
         if (filterFn) {
@@ -49,3 +105,134 @@ export function useJsonData<T>(
 
   return { data, loading, error };
 }
+
+type ShardKey = Record<string, string | number | null>;
+type ShardName = 'by_constituency';
+
+export interface ShardEntry {
+  key: ShardKey;
+  rows: number;
+  file: string;
+  // Columns copied from the rows (export_to_json.SHARD_LABELS), e.g. names
+  labels?: Record<string, string | null>;
+}
+
+interface ShardIndexEntry {
+  hash: string;
+  [shardName: string]: string | { partition_by: string[]; shards: ShardEntry[] };
+}
+
+let shardIndexPromise: Promise<Record<string, ShardIndexEntry>> | null = null;
+
+function loadShardIndex(): Promise<Record<string, ShardIndexEntry>> {
+  if (!shardIndexPromise) {
+    shardIndexPromise = fetch('/data/shards/index.json', { cache: 'no-cache' })
+      .then((response) => (response.ok ? response.json() : {}))
+      .catch(() => ({}));
+  }
+  return shardIndexPromise;
+}
+
+// List the shards of a table from the shard index (a few KB), e.g. to
+// offer the constituencies in a picker without loading the table itself
+export function useShardIndex(filename: string, shardName: ShardName) {
+  const [shards, setShards] = useState<ShardEntry[] | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<Error | null>(null);
+
+  useEffect(() => {
+    let isMounted = true;
+
+    loadShardIndex()
+      .then((index) => {
+        const sharding = index[filename]?.[shardName];
+        if (!sharding || typeof sharding === 'string') {
+          throw new Error(`No ${shardName} shards for ${filename}`);
+        }
+        if (isMounted) {
+          setShards(sharding.shards);
+          setError(null);
+        }
+      })
+      .catch((err) => {
+        if (isMounted) {
+          setError(err as Error);
+        }
+      })
+      .finally(() => {
+        if (isMounted) {
+          setLoading(false);
+        }
+      });
+
+    return () => {
+      isMounted = false;
+    };
+  }, [filename, shardName]);
+
+  return { shards, loading, error };
+}
+
+// Load one shard of a table (e.g. the candidates of a single constituency)
+// instead of the national file. Pass key = null to load nothing yet.
+export function useJsonShard<T>(
+  filename: string,
+  shardName: ShardName,
+  key: ShardKey | null
+) {
+  const [data, setData] = useState<T[] | null>(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<Error | null>(null);
+  const keyString = key ? JSON.stringify(key) : null;
+
+  useEffect(() => {
+    if (!keyString) {
+      setData(null);
+      return;
+    }
+    let isMounted = true;
+    const wanted: ShardKey = JSON.parse(keyString);
+
+    const loadShard = async () => {
+      setLoading(true);
+      try {
+        const entry = (await loadShardIndex())[filename];
+        const sharding = entry?.[shardName];
+        if (!sharding || typeof sharding === 'string') {
+          throw new Error(`No ${shardName} shards for ${filename}`);
+        }
+        const shard = sharding.shards.find((s) =>
+          Object.entries(wanted).every(([column, value]) => String(s.key[column]) === String(value))
+        );
+        let items: T[] = [];
+        if (shard) {
+          const response = await fetch(`/data/${shard.file}?v=${entry.hash}`);
+          if (!response.ok) {
+            throw new Error(`Failed to load ${shard.file}: ${response.status}`);
+          }
+          items = await response.json();
+        }
+        if (isMounted) {
+          setData(items);
+          setError(null);
+        }
+      } catch (err) {
+        if (isMounted) {
+          setError(err as Error);
+        }
+      } finally {
+        if (isMounted) {
+          setLoading(false);
+        }
+      }
+    };
+
+    loadShard();
+
+    return () => {
+      isMounted = false;
+    };
+  }, [filename, shardName, keyString]);
+
+  return { data, loading, error };
+}
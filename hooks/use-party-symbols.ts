@@ -5,6 +5,7 @@ interface PartySymbol {
   party_name_en: string;
   party_name_np: string;
   symbol_url: string | null;
+  symbol_path?: string | null;
   symbol_alt: string | null;
   [key: string]: any;
 }
@@ -12,17 +13,19 @@ interface PartySymbol {
 export function usePartySymbols() {
   const { data: symbols } = useJsonData<PartySymbol>('political_party_symbols');
 
-  // Create a map of party names to symbol URLs for quick lookup
+  // Create a map of party names to symbol URLs for quick lookup,
+  // preferring the local thumbnail over the remote image
   const symbolMap = useMemo(() => {
     if (!symbols) return new Map();
 
     const map = new Map<string, string | null>();
     symbols.forEach((symbol) => {
+      const url = symbol.symbol_path ?? symbol.symbol_url;
       if (symbol.party_name_en) {
-        map.set(symbol.party_name_en, symbol.symbol_url);
+        map.set(symbol.party_name_en, url);
       }
       if (symbol.party_name_np) {
-        map.set(symbol.party_name_np, symbol.symbol_url);
+        map.set(symbol.party_name_np, url);
       }
     });
     return map;
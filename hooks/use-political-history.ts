@@ -1,6 +1,7 @@
 "use client"
 
 import { useState, useEffect } from "react"
+import { dataUrl } from "./use-json-data"
 
 export interface ElectionHistoryEntry {
   year: string
@@ -62,7 +63,8 @@ export function usePoliticalHistory(candidateId?: number) {
 
         // Reuse existing fetch promise if one is in flight
         if (!fetchPromise) {
-          fetchPromise = fetch("/data/candidates_political_history.json")
+          fetchPromise = dataUrl("candidates_political_history")
+            .then((url) => fetch(url))
             .then((response) => {
               if (!response.ok) {
                 throw new Error("Failed to load political history data")
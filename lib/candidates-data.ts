@@ -61,6 +61,8 @@ export interface Candidate extends BaseCandidate {
   constituency_name: number
   election_status: string | null
   current_vote_received: number
+  candidate_image_url: string
+  candidate_image_small_url: string
 
   // 2079 Election data
   prev_election_votes: number | null
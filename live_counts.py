@@ -0,0 +1,251 @@
+"""
+Apply live vote-count changes to the marts without a full dbt rebuild.
+
+Reads the change log written by
+`scrape_scripts/get_current_first_past_the_post_candidates.py --poll` and,
+for each batch of updated candidates:
+
+1. updates TotalVoteReceived / E_STATUS / R in the raw table and
+   current_vote_received / election_status / rank_position in
+   dim_current_fptp_candidates,
+2. recomputes current_rank, current_vote_share, current_margin and
+   current_count_status for the affected constituencies only, plus the
+   current_* summary columns of dim_constituency_profile,
+3. rewrites only those constituencies' by_constituency shards in
+   public/data/shards/ and stores the tables' new fingerprints in the
+   shard index, whose hash versions the shard URLs (?v=).
+
+The definitions mirror the dbt models; running load_raw_data.py, dbt build
+and export_to_json.py remains the reconciliation job (it also refreshes the
+full-table files and the manifest). The manifest keeps the fingerprint
+of the full-table files as last exported, so that export sees the tables
+changed and rewrites them. Added or removed candidates cannot be
+applied here and are reported as needing that rebuild.
+
+The position reached in the change log is kept in the live_counts_offset
+table, so each run (or each --follow iteration) only reads new lines.
+
+Usage:
+    uv run live_counts.py [--changes FILE] [--follow SECONDS]
+"""
+import argparse
+import json
+import os
+import time
+
+import duckdb
+
+import export_to_json
+
+DB_PATH = "election/election.db"
+CHANGES_FILE = "data/current_first_past_the_post_changes.ndjson"
+OUTPUT_DIR = "public/data"
+OFFSET_TABLE = "live_counts_offset"
+RAW_TABLE = "current_first_past_the_post_candidates"
+CANDIDATES_TABLE = "dim_current_fptp_candidates"
+CONSTITUENCY_TABLE = "dim_constituency_profile"
+CONSTITUENCY_KEY = ("state_id", "district_id", "constituency_id")
+
+# Same definitions as the final select of dim_current_fptp_candidates.sql
+CANDIDATE_METRICS_SQL = f"""
+    SELECT
+        candidate_id,
+        CASE
+            WHEN sum(current_vote_received) OVER constituency_window > 0
+                THEN rank() OVER (PARTITION BY state_id, district_id, constituency_id ORDER BY current_vote_received DESC)
+        END AS current_rank,
+        CAST(current_vote_received AS DOUBLE) / nullif(sum(current_vote_received) OVER constituency_window, 0)
+            AS current_vote_share,
+        CASE
+            WHEN sum(current_vote_received) OVER constituency_window > 0
+                THEN current_vote_received - coalesce(max(current_vote_received) OVER other_candidates_window, 0)
+        END AS current_margin,
+        CASE
+            WHEN election_status IS NOT NULL THEN 'won'
+            WHEN sum(current_vote_received) OVER constituency_window = 0 THEN NULL
+            WHEN current_vote_received = max(current_vote_received) OVER constituency_window THEN 'leading'
+            ELSE 'trailing'
+        END AS current_count_status
+    FROM {CANDIDATES_TABLE}
+    WHERE (state_id, district_id, constituency_id) IN (SELECT (state_id, district_id, constituency_id) FROM affected)
+    WINDOW
+        constituency_window AS (PARTITION BY state_id, district_id, constituency_id),
+        other_candidates_window AS (
+            PARTITION BY state_id, district_id, constituency_id
+            ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING EXCLUDE CURRENT ROW
+        )
+"""
+
+# Same definitions as the current_counts CTE of dim_constituency_profile.sql
+CONSTITUENCY_METRICS_SQL = f"""
+    SELECT
+        state_id,
+        district_id,
+        constituency_id,
+        sum(current_vote_received) AS current_total_votes,
+        min(candidate_id) FILTER (WHERE current_rank = 1) AS current_leading_candidate_id,
+        arg_min(political_party_name, candidate_id) FILTER (WHERE current_rank = 1) AS current_leading_party,
+        CAST(max(current_margin) FILTER (WHERE current_rank = 1) AS DOUBLE)
+            / nullif(sum(current_vote_received), 0) AS current_lead_margin
+    FROM {CANDIDATES_TABLE}
+    WHERE (state_id, district_id, constituency_id) IN (SELECT (state_id, district_id, constituency_id) FROM affected)
+    GROUP BY state_id, district_id, constituency_id
+"""
+
+
+def read_changes(path, offset=0):
+    """Return (change records after byte offset, new offset); a trailing partial line is left for later."""
+    if not os.path.exists(path):
+        return [], offset
+    changes = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                changes.append(json.loads(line))
+    return changes, offset
+
+
+def load_offset(con, path):
+    con.execute(f"CREATE TABLE IF NOT EXISTS {OFFSET_TABLE} (changes_file VARCHAR PRIMARY KEY, byte_offset BIGINT)")
+    row = con.execute(f"SELECT byte_offset FROM {OFFSET_TABLE} WHERE changes_file = ?", [path]).fetchone()
+    return row[0] if row else 0
+
+
+def save_offset(con, path, offset):
+    con.execute(f"INSERT OR REPLACE INTO {OFFSET_TABLE} VALUES (?, ?)", [path, offset])
+
+
+def latest_updates(changes):
+    """Collapse change records to the latest row per updated candidate; count structural changes."""
+    latest = {}
+    structural = 0
+    for change in changes:
+        if change["change"] != "updated":
+            structural += 1
+            continue
+        latest[change["CandidateID"]] = change["row"]
+    return list(latest.values()), structural
+
+
+def apply_updates(con, rows, output_dir=OUTPUT_DIR):
+    """
+    Apply updated source rows and refresh the affected constituencies.
+
+    Returns the list of affected constituency keys.
+    """
+    if not rows:
+        return []
+    con.execute("BEGIN")
+    try:
+        con.execute("CREATE OR REPLACE TEMP TABLE changed (candidate_id BIGINT, votes BIGINT, status VARCHAR, r BIGINT)")
+        con.executemany(
+            "INSERT INTO changed VALUES (?, ?, ?, ?)",
+            [[row["CandidateID"], row.get("TotalVoteReceived"), row.get("E_STATUS"), row.get("R")] for row in rows],
+        )
+        con.execute(f"""
+            UPDATE {RAW_TABLE} SET "TotalVoteReceived" = c.votes, "E_STATUS" = c.status, "R" = c.r
+            FROM changed c WHERE {RAW_TABLE}."CandidateID" = c.candidate_id
+        """)
+        con.execute(f"""
+            UPDATE {CANDIDATES_TABLE}
+            SET current_vote_received = c.votes, election_status = c.status, rank_position = c.r
+            FROM changed c WHERE {CANDIDATES_TABLE}.candidate_id = c.candidate_id
+        """)
+        con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE affected AS
+            SELECT DISTINCT state_id, district_id, constituency_id
+            FROM {CANDIDATES_TABLE} WHERE candidate_id IN (SELECT candidate_id FROM changed)
+        """)
+        con.execute(f"""
+            UPDATE {CANDIDATES_TABLE}
+            SET current_rank = m.current_rank, current_vote_share = m.current_vote_share,
+                current_margin = m.current_margin, current_count_status = m.current_count_status
+            FROM ({CANDIDATE_METRICS_SQL}) m
+            WHERE {CANDIDATES_TABLE}.candidate_id = m.candidate_id
+        """)
+        con.execute(f"""
+            UPDATE {CONSTITUENCY_TABLE}
+            SET current_total_votes = m.current_total_votes,
+                current_leading_candidate_id = m.current_leading_candidate_id,
+                current_leading_party = m.current_leading_party,
+                current_lead_margin = m.current_lead_margin
+            FROM ({CONSTITUENCY_METRICS_SQL}) m
+            WHERE {CONSTITUENCY_TABLE}.state_id = m.state_id
+              AND {CONSTITUENCY_TABLE}.district_id = m.district_id
+              AND {CONSTITUENCY_TABLE}.constituency_id = m.constituency_id
+        """)
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+    affected = con.execute("SELECT * FROM affected ORDER BY ALL").fetchall()
+    outputs = dict(export_to_json.table_entries())
+    shard_index = export_to_json.load_shard_index(output_dir)
+    for table_name in (CANDIDATES_TABLE, CONSTITUENCY_TABLE):
+        select_list = export_to_json.json_select_list(con, table_name)
+        # constituency_id is text in dim_constituency_profile, so compare column by column
+        where = f"""EXISTS (
+            SELECT 1 FROM affected a WHERE a.state_id = {table_name}.state_id
+            AND a.district_id = {table_name}.district_id AND a.constituency_id = {table_name}.constituency_id
+        )"""
+        export_to_json.write_table_shards(
+            con, table_name, select_list, output_dir, outputs[table_name],
+            where=where, shard_names=["by_constituency"],
+        )
+        # Only updates are applied, so the shard list itself is unchanged
+        if outputs[table_name] in shard_index:
+            shard_index[outputs[table_name]]["hash"] = export_to_json.table_fingerprint(con, table_name, select_list)
+    if shard_index:
+        export_to_json.save_shard_index(output_dir, shard_index)
+    return [dict(zip(CONSTITUENCY_KEY, key)) for key in affected]
+
+
+def process(con, changes_path=CHANGES_FILE, output_dir=OUTPUT_DIR):
+    """Apply the change-log lines not processed yet; returns (updated candidates, affected constituencies)."""
+    offset = load_offset(con, changes_path)
+    changes, new_offset = read_changes(changes_path, offset)
+    if not changes:
+        return 0, 0
+    rows, structural = latest_updates(changes)
+    start = time.perf_counter()
+    affected = apply_updates(con, rows, output_dir)
+    save_offset(con, changes_path, new_offset)
+    print(f"  ✓ Applied {len(rows)} candidate update(s) to {len(affected)} constituency(ies) "
+          f"in {time.perf_counter() - start:.3f}s")
+    if structural:
+        print(f"  ! {structural} added/removed candidate(s) need a full rebuild "
+              f"(load_raw_data.py, dbt build, export_to_json.py)")
+    return len(rows), len(affected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply live vote-count changes to the marts and shards.")
+    parser.add_argument("--changes", default=CHANGES_FILE, help=f"Change log (default: {CHANGES_FILE})")
+    parser.add_argument("--db", default=DB_PATH, help=f"DuckDB database (default: {DB_PATH})")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help=f"Export directory (default: {OUTPUT_DIR})")
+    parser.add_argument("--follow", type=float, metavar="SECONDS",
+                        help="Keep watching the change log at this interval")
+    args = parser.parse_args()
+
+    con = duckdb.connect(args.db)
+    try:
+        while True:
+            updated, _ = process(con, args.changes, args.output_dir)
+            if args.follow is None:
+                if not updated:
+                    print("No new changes.")
+                break
+            time.sleep(args.follow)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,31 @@
 """
-Load raw JSON and CSV data from the data/ directory into DuckDB.
+Load raw JSON, CSV and Parquet data from the data/ directory into DuckDB.
 Creates an election.db database with tables for each data file.
+
+Loads are incremental: the size, mtime and hash of every source file are
+recorded in a metadata table, and tables whose files have not changed are
+skipped.
+Sources are read with the column types declared in raw_schemas.py, and
+independent tables are loaded concurrently.
 """
+import argparse
+import hashlib
+import os
+import sys
+import time
 import duckdb
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from glob import glob
 
+from raw_schemas import SOURCE_SCHEMAS, columns_argument
+
 # Define the database path
 DB_PATH = "election/election.db"
 
+# Table recording the size, mtime and sha256 of every loaded source file
+METADATA_TABLE = "raw_load_metadata"
+
 # Define the data files to load (supports .json and .csv)
 DATA_FILES = {
     "states": "data/states.json",
@@ -16,67 +33,251 @@ DATA_FILES = {
     "constituency": "data/constituency.json",
     "local_bodies": "data/local_bodies.json",
     "candidate_address_to_district_mapping": "data/candidate_address_to_district_mapping.json",
-    "current_first_past_the_post_candidates": "data/current_first_past_the_post_candidates.json",
+    "current_first_past_the_post_candidates": "data/current_first_past_the_post_candidates.ndjson",
     "current_proportional_election_candidates": "data/current_proportional_election_candidates.csv",
-    "past_2079_first_past_the_post_election_result": "data/past_2079_first_past_the_post_election_result.json",
+    "past_2079_first_past_the_post_election_result": "data/past_2079_first_past_the_post_election_result.ndjson",
     "past_2079_proportional_election_result": "data/past_2079_proportional_election_result.json",
     "parliament_members": "data/parliament_members.json",
-    "past_2074_first_past_the_post_election_result": "data/2074_first_past_the_post_election_result.json",
-    "past_2074_proportional_election_result": "data/2074_proportional_election_result.json",
+    "past_2074_first_past_the_post_election_result": "data/2074_first_past_the_post_election_result.ndjson",
+    "past_2074_proportional_election_result": "data/2074_proportional_election_result.ndjson",
     "political_party_symbols": "data/political_party_symbols.json",
-    "candidates_political_history": "data/candidates_history/*.json"
+    "candidates_political_history": "data/candidates_history.parquet",
+    "candidate_photos": "data/candidate_photos.json"
 }
 
+
+def reader_for(table_name, file_path, auto_schema=False):
+    """
+    Return the DuckDB table function reading a source file or glob.
+
+    Uses the columns declared in SOURCE_SCHEMAS; falls back to type
+    inference (read_json_auto / read_csv_auto) for undeclared sources or
+    when auto_schema is set. Parquet sources carry their own types.
+    """
+    source = f"'{file_path}'"
+    extension = Path(file_path).suffix
+    is_csv = extension == ".csv"
+
+    if extension == ".parquet":
+        return f"read_parquet({source})"
+
+    schema = None if auto_schema else SOURCE_SCHEMAS.get(table_name)
+    if schema is None:
+        # Pick the right reader based on file extension
+        if is_csv:
+            return f"read_csv_auto({source})"
+        return f"read_json_auto({source})"
+
+    columns = columns_argument(schema)
+    if is_csv:
+        return f"read_csv({source}, header = true, columns = {columns})"
+    return f"read_json({source}, columns = {columns})"
+
+
+def file_sha256(path):
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def ensure_metadata_table(con):
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {METADATA_TABLE} (
+            table_name VARCHAR,
+            file_path VARCHAR,
+            size BIGINT,
+            mtime DOUBLE,
+            sha256 VARCHAR,
+            loaded_at TIMESTAMP DEFAULT current_timestamp,
+            PRIMARY KEY (table_name, file_path)
+        )
+    """)
+
+
+def detect_changes(con, table_name, paths):
+    """
+    Compare source files against what was recorded at the last load.
+
+    Files whose size and mtime are unchanged are trusted without hashing;
+    otherwise the sha256 decides (a touched but identical file is unchanged).
+
+    Returns (changed, removed, signatures) where signatures maps every
+    current path to its (size, mtime, sha256).
+    """
+    recorded = {
+        file_path: (size, mtime, sha256)
+        for file_path, size, mtime, sha256 in con.execute(
+            f"SELECT file_path, size, mtime, sha256 FROM {METADATA_TABLE} WHERE table_name = ?",
+            [table_name],
+        ).fetchall()
+    }
+
+    changed = []
+    signatures = {}
+    for path in paths:
+        stat = os.stat(path)
+        previous = recorded.get(path)
+        if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime:
+            signatures[path] = previous
+            continue
+        sha256 = file_sha256(path)
+        signatures[path] = (stat.st_size, stat.st_mtime, sha256)
+        if not previous or previous[2] != sha256:
+            changed.append(path)
+
+    removed = [path for path in recorded if path not in signatures]
+    return changed, removed, signatures
+
+
+def record_files(con, table_name, signatures, removed):
+    """Store the signatures of the loaded files and forget removed ones."""
+    if removed:
+        con.execute(
+            f"DELETE FROM {METADATA_TABLE} WHERE table_name = ? AND file_path IN (SELECT unnest(?))",
+            [table_name, removed],
+        )
+    if not signatures:
+        return
+    # One set-based insert; executemany is row-at-a-time for thousands of files
+    paths = list(signatures)
+    sizes, mtimes, hashes = (list(column) for column in zip(*signatures.values()))
+    con.execute(
+        f"""
+        INSERT OR REPLACE INTO {METADATA_TABLE} (table_name, file_path, size, mtime, sha256, loaded_at)
+        SELECT ?, unnest(?), unnest(?), unnest(?), unnest(?), current_timestamp
+        """,
+        [table_name, paths, sizes, mtimes, hashes],
+    )
+
+
+def table_columns(con, table_name):
+    """Return the column names of a table, or [] if it does not exist."""
+    return [
+        row[0] for row in con.execute(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = ?", [table_name]
+        ).fetchall()
+    ]
+
+
+def load_source(con, table_name, file_path, force=False, auto_schema=False):
+    """
+    Load one source into its table, skipping it when its files are unchanged.
+
+    Runs on a worker thread with its own cursor, so progress is collected in
+    result["log"] and printed by the caller. Metadata is not written here;
+    the caller records result["signatures"] once the table is loaded.
+    """
+    start = time.perf_counter()
+    result = {"status": "skipped", "rows": 0, "log": [], "signatures": {}, "removed": []}
+    log = result["log"]
+    log.append(f"\nLoading {file_path} into table '{table_name}'...")
+    is_glob = "*" in file_path
+
+    # Check if path contains glob pattern
+    if is_glob:
+        # Handle glob patterns (multiple files)
+        paths = sorted(glob(file_path))
+
+        if not paths:
+            log.append(f"  WARNING: No files matching pattern {file_path}, skipping...")
+            result["seconds"] = time.perf_counter() - start
+            return result
+
+        log.append(f"  Found {len(paths)} file(s) matching pattern")
+    else:
+        # Handle single files
+        if not Path(file_path).exists():
+            log.append(f"  WARNING: File {file_path} not found, skipping...")
+            result["seconds"] = time.perf_counter() - start
+            return result
+        paths = [file_path]
+
+    changed, removed, signatures = detect_changes(con, table_name, paths)
+    columns = table_columns(con, table_name)
+    # A column newly declared in raw_schemas.py also needs a reload
+    declared = {} if auto_schema else SOURCE_SCHEMAS.get(table_name, {})
+    schema_changed = bool(columns) and any(column not in columns for column in declared)
+
+    if columns and not force and not changed and not removed and not schema_changed:
+        log.append(f"  = Unchanged, skipping '{table_name}'")
+        result["status"] = "unchanged"
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    # Create table from data file
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        SELECT * FROM {reader_for(table_name, file_path, auto_schema=auto_schema)}
+    """)
+
+    # Get row count
+    row_count = con.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+    log.append(f"  ✓ Loaded {row_count:,} rows into '{table_name}'")
+    result.update(status="loaded", rows=row_count, signatures=signatures, removed=removed)
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def load_tables(con, data_files=DATA_FILES, force=False, auto_schema=False, workers=None):
+    """
+    Load every source of data_files concurrently, print the per-table logs
+    and record the metadata of the loaded ones.
+
+    Returns {table_name: result} (see load_source); status "loaded" marks
+    the tables whose inputs changed and "failed" the ones that could not be
+    loaded (with the exception in result["error"]).
+    """
+    ensure_metadata_table(con)
+
+    # Every source feeds its own table, so they can load in parallel; each
+    # worker thread gets its own cursor on the shared database
+    def run(table_name, file_path):
+        cursor = con.cursor()
+        try:
+            return load_source(cursor, table_name, file_path, force=force, auto_schema=auto_schema)
+        finally:
+            cursor.close()
+
+    with ThreadPoolExecutor(max_workers=workers or min(len(data_files), os.cpu_count() or 1)) as executor:
+        futures = {
+            table_name: executor.submit(run, table_name, file_path)
+            for table_name, file_path in data_files.items()
+        }
+
+    results = {}
+    for table_name, future in futures.items():
+        try:
+            results[table_name] = future.result()
+        except Exception as e:
+            print(f"\n  ✗ Error loading '{table_name}': {e}")
+            results[table_name] = {"status": "failed", "rows": 0, "seconds": 0.0, "error": e}
+            continue
+        print("\n".join(results[table_name]["log"]))
+        if results[table_name]["status"] == "loaded":
+            record_files(con, table_name, results[table_name]["signatures"], results[table_name]["removed"])
+    return results
+
+
 def main():
     """Load all data files into DuckDB."""
+    parser = argparse.ArgumentParser(description="Load raw data files into DuckDB.")
+    parser.add_argument("--force", action="store_true", help="Reload every table even if its files are unchanged")
+    parser.add_argument("--auto-schema", action="store_true",
+                        help="Infer column types with read_json_auto/read_csv_auto instead of raw_schemas.py")
+    parser.add_argument("--workers", type=int, default=min(len(DATA_FILES), os.cpu_count() or 1),
+                        help="Tables loaded concurrently (default: up to the CPU count)")
+    args = parser.parse_args()
+
     print(f"Initializing DuckDB database: {DB_PATH}")
+    start = time.perf_counter()
 
     # Connect to DuckDB (creates the database if it doesn't exist)
     con = duckdb.connect(DB_PATH)
-
-    # Load each data file into a table
-    for table_name, file_path in DATA_FILES.items():
-        print(f"\nLoading {file_path} into table '{table_name}'...")
-
-        # Check if path contains glob pattern
-        if "*" in file_path:
-            # Handle glob patterns (multiple files)
-            matching_files = glob(file_path)
-            
-            if not matching_files:
-                print(f"  WARNING: No files matching pattern {file_path}, skipping...")
-                continue
-            
-            print(f"  Found {len(matching_files)} file(s) matching pattern")
-            for matched_file in matching_files:
-                print(f"    - {matched_file}")
-            
-            # Use glob pattern directly with DuckDB (it supports glob patterns)
-            if file_path.endswith(".csv"):
-                read_func = f"read_csv_auto('{file_path}')"
-            else:
-                read_func = f"read_json_auto('{file_path}')"
-        else:
-            # Handle single files
-            if not Path(file_path).exists():
-                print(f"  WARNING: File {file_path} not found, skipping...")
-                continue
-
-            # Pick the right reader based on file extension
-            if file_path.endswith(".csv"):
-                read_func = f"read_csv_auto('{file_path}')"
-            else:
-                read_func = f"read_json_auto('{file_path}')"
-
-        # Create table from data file
-        con.execute(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
-            SELECT * FROM {read_func}
-        """)
-        
-        # Get row count
-        row_count = con.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
-        print(f"  ✓ Loaded {row_count:,} rows into '{table_name}'")
+    results = load_tables(con, force=args.force, auto_schema=args.auto_schema, workers=args.workers)
+    wall_time = time.perf_counter() - start
     
     # Display summary
     print("\n" + "="*60)
@@ -87,12 +288,22 @@ def main():
     for (table_name,) in tables:
         row_count = con.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
         print(f"  {table_name}: {row_count:,} rows")
-    
-    print("\n✓ Data loading complete!")
-    print(f"✓ Database saved to: {DB_PATH}")
-    
+
+    print("\nLoad time per table:")
+    for table_name, result in results.items():
+        print(f"  {table_name:<48} {result['seconds']:>7.3f}s  {result['status']}")
+    print(f"  {'total (wall)':<48} {wall_time:>7.3f}s")
+
     # Close connection
     con.close()
 
+    failed = [table_name for table_name, result in results.items() if result["status"] == "failed"]
+    if failed:
+        print(f"\n✗ Failed to load {len(failed)} table(s): {', '.join(failed)}")
+        sys.exit(1)
+
+    print("\n✓ Data loading complete!")
+    print(f"✓ Database saved to: {DB_PATH}")
+
 if __name__ == "__main__":
     main()
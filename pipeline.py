@@ -0,0 +1,271 @@
+"""
+Refresh the site data: scrape, load, build and export in one command.
+
+Every scraped source is declared once in SOURCES with its script, source
+URL and target path. The target path is always the load_raw_data.DATA_FILES
+entry of the table it feeds, so a scraper can no longer write a file the
+loader does not read. Stages:
+
+1. scrape  - the selected scrapers run as subprocesses, independent ones in
+             parallel; a source starts once the sources it reads from
+             (`after`) have finished, and is skipped if one of them failed.
+2. load    - load_raw_data reloads only the tables whose files changed.
+3. dbt     - `dbt build` on the models downstream of the reloaded tables.
+4. export  - export_to_json rewrites only the exported tables downstream
+             of those models (and skips any whose fingerprint is unchanged).
+
+Nothing after the scrape stage runs when no input changed. Ends with a
+per-stage (and per-source) timing breakdown, and exits non-zero when a
+scraper or stage failed.
+
+Usage:
+    uv run pipeline.py                        # scrape everything, then rebuild what changed
+    uv run pipeline.py --only current_first_past_the_post_candidates candidate_photos
+    uv run pipeline.py --skip-scrape          # only rebuild from the files in data/
+    uv run pipeline.py --list
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+import duckdb
+
+import export_to_json
+import load_raw_data
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPE_DIR = os.path.join(SCRIPT_DIR, "scrape_scripts")
+DBT_DIR = os.path.join(SCRIPT_DIR, "election")
+DBT_MANIFEST = os.path.join(DBT_DIR, "target", "manifest.json")
+WORKERS = 4
+
+
+@dataclass(frozen=True)
+class Source:
+    """One scraped input: the DATA_FILES table it feeds and how to fetch it."""
+    name: str
+    script: str
+    url: str
+    url_flag: str = "--url"
+    output_flag: str = "--output"
+    extra_args: tuple = ()
+    after: tuple = ()
+
+    @property
+    def output(self):
+        return load_raw_data.DATA_FILES[self.name]
+
+    def command(self):
+        return [
+            sys.executable, os.path.join(SCRAPE_DIR, self.script),
+            self.url_flag, self.url, self.output_flag, self.output, *self.extra_args,
+        ]
+
+
+SOURCES = [
+    Source(
+        "current_first_past_the_post_candidates",
+        "get_current_first_past_the_post_candidates.py",
+        "https://result.election.gov.np/JSONFiles/ElectionResultCentral2082.txt",
+    ),
+    Source(
+        "past_2079_first_past_the_post_election_result",
+        "get_2079_first_past_the_post_election_result.py",
+        "https://result.election.gov.np/JSONFiles/ElectionResultCentral2079.txt",
+    ),
+    Source(
+        "past_2079_proportional_election_result",
+        "get_2079_proportional_election_result.py",
+        "https://result.election.gov.np/JSONFiles/Election2079/HOR/PR/HOR",
+        url_flag="--base-url",
+    ),
+    Source(
+        "past_2074_first_past_the_post_election_result",
+        "get_2074_first_past_the_post_election_result.py",
+        "https://result.election.gov.np/JSONFiles/ElectionResultCentral.txt",
+    ),
+    Source(
+        "past_2074_proportional_election_result",
+        "get_2074_proportional_election_result.py",
+        "https://result.election.gov.np/JSONFiles/ElectionResultCentralPR.txt",
+    ),
+    Source(
+        "parliament_members",
+        "get_parliament_members.py",
+        "https://hr.parliament.gov.np/api/v1/members",
+    ),
+    Source(
+        "political_party_symbols",
+        "scrape_party_symbols.py",
+        "https://en.wikipedia.org/wiki/List_of_political_parties_in_Nepal",
+    ),
+    Source(
+        "candidate_photos",
+        "mirror_candidate_photos.py",
+        "https://result.election.gov.np/Images/Candidate/{}.jpg",
+        url_flag="--photo-url",
+        output_flag="--manifest",
+        extra_args=("--candidates", load_raw_data.DATA_FILES["current_first_past_the_post_candidates"]),
+        after=("current_first_past_the_post_candidates",),
+    ),
+]
+SOURCES_BY_NAME = {source.name: source for source in SOURCES}
+
+
+def run_scrapers(sources, workers=WORKERS):
+    """
+    Run the scrapers, each as soon as the sources it reads from are done.
+
+    Output is printed per scraper when it finishes, so parallel runs do not
+    interleave. Returns {name: {"status": "ok"|"failed"|"skipped", "seconds"}}.
+    """
+    selected = {source.name for source in sources}
+    results = {}
+    pending = list(sources)
+    running = {}
+
+    def run(source):
+        start = time.perf_counter()
+        process = subprocess.run(source.command(), cwd=SCRIPT_DIR, capture_output=True, text=True)
+        return process, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for source in list(pending):
+                # Dependencies outside the selection are taken from data/ as they are
+                waiting_for = [name for name in source.after if name in selected]
+                if any(results.get(name, {}).get("status") in ("failed", "skipped") for name in waiting_for):
+                    results[source.name] = {"status": "skipped", "seconds": 0.0}
+                    print(f"  - {source.name}: skipped, an input failed")
+                    pending.remove(source)
+                elif all(name in results for name in waiting_for):
+                    print(f"  → {source.name}: {source.script} → {source.output}")
+                    running[executor.submit(run, source)] = source
+                    pending.remove(source)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                source = running.pop(future)
+                process, seconds = future.result()
+                ok = process.returncode == 0
+                results[source.name] = {"status": "ok" if ok else "failed", "seconds": seconds}
+                print(f"\n{'✓' if ok else '✗'} {source.name} ({seconds:.1f}s)")
+                output = (process.stdout + process.stderr).rstrip()
+                if output:
+                    print("    " + output.replace("\n", "\n    "))
+    return results
+
+
+def downstream_exports(changed_tables, manifest_path=DBT_MANIFEST):
+    """
+    Return the export_to_json.TABLES entries that depend on changed raw
+    tables, following the dbt manifest's child map (raw tables exported
+    as-is count too).
+    """
+    with open(manifest_path, encoding="utf-8") as f:
+        child_map = json.load(f)["child_map"]
+    affected = set(changed_tables)
+    queue = [f"source.election.raw.{table}" for table in changed_tables]
+    while queue:
+        for child in child_map.get(queue.pop(), []):
+            name = child.rsplit(".", 1)[-1]
+            if child.startswith("model.") and name not in affected:
+                affected.add(name)
+                queue.append(child)
+    return [entry for entry in export_to_json.TABLES
+            if (entry[0] if isinstance(entry, tuple) else entry) in affected]
+
+
+def dbt_command():
+    dbt = shutil.which("dbt") or os.path.join(os.path.dirname(sys.executable), "dbt")
+    return [dbt]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape, load, build and export the election data.")
+    parser.add_argument("--only", nargs="+", metavar="SOURCE", choices=list(SOURCES_BY_NAME),
+                        help="Scrape only these sources (default: all)")
+    parser.add_argument("--skip-scrape", action="store_true", help="Rebuild from the files already in data/")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Scrapers run in parallel (default: {WORKERS})")
+    parser.add_argument("--force", action="store_true",
+                        help="Reload, rebuild and re-export everything even if no input changed")
+    parser.add_argument("--list", action="store_true", help="List the declared sources and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for source in SOURCES:
+            after = f"  (after {', '.join(source.after)})" if source.after else ""
+            print(f"{source.name:<48} {source.output}\n{'':<48} {source.url}{after}")
+        return
+
+    # DATA_FILES and DB_PATH are relative to the repository root
+    os.chdir(SCRIPT_DIR)
+    timings = []
+    failed = False
+
+    if not args.skip_scrape:
+        sources = [SOURCES_BY_NAME[name] for name in args.only] if args.only else SOURCES
+        print(f"=== scrape: {len(sources)} source(s), {args.workers} in parallel ===")
+        start = time.perf_counter()
+        scrape_results = run_scrapers(sources, args.workers)
+        timings.append(("scrape", time.perf_counter() - start, f"{len(sources)} source(s)"))
+        for name, result in scrape_results.items():
+            timings.append((f"  {name}", result["seconds"], result["status"]))
+        failed = any(result["status"] != "ok" for result in scrape_results.values())
+
+    print("\n=== load ===")
+    start = time.perf_counter()
+    con = duckdb.connect(load_raw_data.DB_PATH)
+    try:
+        load_results = load_raw_data.load_tables(con, force=args.force)
+    finally:
+        con.close()
+    changed = [table for table, result in load_results.items() if result["status"] == "loaded"]
+    failed |= any(result["status"] == "failed" for result in load_results.values())
+    timings.append(("load", time.perf_counter() - start, f"{len(changed)} table(s) reloaded"))
+
+    if changed or args.force:
+        print(f"\n=== dbt: downstream of {', '.join(changed) or 'everything (--force)'} ===")
+        start = time.perf_counter()
+        command = [*dbt_command(), "build"]
+        if not args.force:
+            command += ["--select", " ".join(f"source:raw.{table}+" for table in changed)]
+        dbt_ok = subprocess.run(command, cwd=DBT_DIR).returncode == 0
+        failed |= not dbt_ok
+        timings.append(("dbt", time.perf_counter() - start, "ok" if dbt_ok else "failed"))
+
+        tables = export_to_json.TABLES if args.force else downstream_exports(changed)
+        print(f"\n=== export: {len(tables)} table(s) ===")
+        start = time.perf_counter()
+        if tables:
+            os.makedirs(export_to_json.OUTPUT_DIR, exist_ok=True)
+            results = export_to_json.export_tables(
+                export_to_json.SOURCE_DB, export_to_json.OUTPUT_DIR, tables=tables,
+                workers=min(len(tables), os.cpu_count() or 1), force=args.force,
+            )
+            written = sum(1 for result in results.values() if result["written"])
+            failed |= any(not result["hash"] for result in results.values())
+            timings.append(("export", time.perf_counter() - start, f"{written}/{len(tables)} table(s) written"))
+        else:
+            timings.append(("export", 0.0, "nothing downstream"))
+    else:
+        print("\n= No input changed; dbt and export skipped")
+        timings.append(("dbt", 0.0, "skipped"))
+        timings.append(("export", 0.0, "skipped"))
+
+    print("\nTime per stage:")
+    for stage, seconds, detail in timings:
+        print(f"  {stage:<50} {seconds:>8.2f}s  {detail}")
+    print(f"\n{'✗ Finished with failures' if failed else '✓ Data refreshed'}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()